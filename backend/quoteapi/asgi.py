@@ -3,6 +3,10 @@ ASGI config for quoteapi project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The live /api/events/ stream is only served through this entry point, e.g.
+``uvicorn quoteapi.asgi:application``. Its pub/sub hub lives in-process, so
+run a single worker for it.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -68,6 +68,13 @@ REST_FRAMEWORK = {
     ]
 }
 
+# Cursor pagination for quote lists (?page_size= may override up to the max)
+QUOTE_PAGE_SIZE = int(os.environ.get("QUOTE_PAGE_SIZE", 25))
+QUOTE_MAX_PAGE_SIZE = int(os.environ.get("QUOTE_MAX_PAGE_SIZE", 100))
+
+# Largest signature image accepted by /api/signatures/upload/
+SIGNATURE_UPLOAD_MAX_BYTES = int(os.environ.get("SIGNATURE_UPLOAD_MAX_BYTES", 1024 * 1024))
+
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # <-- Must be very first
     'django.middleware.common.CommonMiddleware',
@@ -81,6 +88,17 @@ MIDDLEWARE = [
     'allauth.account.middleware.AccountMiddleware',
 ]
 
+# QUOTEBOOK_PERF=1 records wall time, queries, DB time, serializer time and
+# response size per endpoint (quotes/perf.py), reported to superusers at
+# /api/debug/perf/. Queries slower than PERF_SLOW_QUERY_MS are logged.
+QUOTEBOOK_PERF = os.environ.get("QUOTEBOOK_PERF", "0") == "1"
+PERF_SAMPLES = int(os.environ.get("QUOTEBOOK_PERF_SAMPLES", 500))
+PERF_SLOW_QUERY_MS = float(os.environ.get("QUOTEBOOK_PERF_SLOW_QUERY_MS", 100))
+
+if QUOTEBOOK_PERF:
+    # right after CORS, so session and auth queries are counted too
+    MIDDLEWARE.insert(1, 'quotes.perf.PerfMiddleware')
+
 ROOT_URLCONF = 'quoteapi.urls'
 
 TEMPLATES = [
@@ -99,11 +117,36 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'quoteapi.wsgi.application'
+ASGI_APPLICATION = 'quoteapi.asgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# QUOTEBOOK_DB_PROFILE=production switches SQLite to WAL with relaxed fsync,
+# a busy timeout, write transactions that take the lock up front and
+# persistent connections. PRAGMAS are applied to every new connection by
+# quotes.database.apply_sqlite_pragmas.
+
+QUOTEBOOK_DB_PROFILE = os.environ.get("QUOTEBOOK_DB_PROFILE", "development")
+
+SQLITE_PRODUCTION_PROFILE = {
+    'CONN_MAX_AGE': int(os.environ.get("QUOTEBOOK_DB_CONN_MAX_AGE", 600)),
+    'CONN_HEALTH_CHECKS': True,
+    'OPTIONS': {
+        # BEGIN IMMEDIATE: a read-then-write transaction can't fail to upgrade its lock
+        'transaction_mode': 'IMMEDIATE',
+    },
+    'PRAGMAS': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': int(os.environ.get("QUOTEBOOK_SQLITE_BUSY_TIMEOUT_MS", 10000)),
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,  # negative = KiB, so 64 MiB
+        'temp_store': 'MEMORY',
+    },
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
@@ -111,6 +154,75 @@ DATABASES = {
     }
 }
 
+if QUOTEBOOK_DB_PROFILE == "production":
+    DATABASES['default'].update(SQLITE_PRODUCTION_PROFILE)
+
+# QUOTEBOOK_DB_ENGINE=postgres moves the default database to PostgreSQL.
+# Connections come from psycopg's pool by default; with
+# QUOTEBOOK_DB_POOL=pgbouncer Django keeps short-lived connections to an
+# external transaction-mode pooler instead. Existing data is copied over
+# with `manage.py copy_from_sqlite db.sqlite3`.
+
+if os.environ.get("QUOTEBOOK_DB_ENGINE", "sqlite") == "postgres":
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get("QUOTEBOOK_DB_NAME", "quotebook"),
+        'USER': os.environ.get("QUOTEBOOK_DB_USER", "quotebook"),
+        'PASSWORD': os.environ.get("QUOTEBOOK_DB_PASSWORD", ""),
+        'HOST': os.environ.get("QUOTEBOOK_DB_HOST", "127.0.0.1"),
+        'PORT': os.environ.get("QUOTEBOOK_DB_PORT", "5432"),
+    }
+    if os.environ.get("QUOTEBOOK_DB_POOL", "psycopg") == "pgbouncer":
+        DATABASES['default'].update({
+            'CONN_MAX_AGE': int(os.environ.get("QUOTEBOOK_DB_CONN_MAX_AGE", 0)),
+            # server-side cursors don't survive transaction pooling
+            'DISABLE_SERVER_SIDE_CURSORS': True,
+        })
+    else:
+        DATABASES['default']['OPTIONS'] = {
+            'pool': {
+                'min_size': int(os.environ.get("QUOTEBOOK_DB_POOL_MIN", 2)),
+                'max_size': int(os.environ.get("QUOTEBOOK_DB_POOL_MAX", 20)),
+                'timeout': int(os.environ.get("QUOTEBOOK_DB_POOL_TIMEOUT", 10)),
+            },
+        }
+
+
+# Caches
+# "quotes" holds rendered quote representations (see quotes/cache.py).
+# QUOTE_CACHE_BACKEND picks local memory (LRU), a file-based cache, or a
+# Redis-compatible server; entries expire after QUOTE_CACHE_TTL seconds.
+
+QUOTE_CACHE_BACKEND = os.environ.get("QUOTE_CACHE_BACKEND", "locmem")
+
+_QUOTE_CACHE_BACKENDS = {
+    "locmem": {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'quote-representations',
+        'OPTIONS': {'MAX_ENTRIES': int(os.environ.get("QUOTE_CACHE_MAX_ENTRIES", 5000))},
+    },
+    "file": {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get("QUOTE_CACHE_DIR", str(BASE_DIR / '.cache' / 'quotes')),
+        'OPTIONS': {'MAX_ENTRIES': int(os.environ.get("QUOTE_CACHE_MAX_ENTRIES", 5000))},
+    },
+    "redis": {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get("QUOTE_CACHE_REDIS_URL", "redis://127.0.0.1:6379/1"),
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'quotes': {
+        **_QUOTE_CACHE_BACKENDS[QUOTE_CACHE_BACKEND],
+        'TIMEOUT': int(os.environ.get("QUOTE_CACHE_TTL", 300)),
+        'KEY_PREFIX': 'quotebook',
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -37,16 +37,25 @@ urlpatterns = [
     path("admin/users/<int:user_id>/", views.delete_user),
     path("quotes/<int:quote_id>/flag/", views.flag_quote, name="flag-quote"),
     path('debug/refuse/', views.debug_run_refuse),
+    path('api/debug/perf/', views.debug_perf, name='debug-perf'),
     path("users/unapproved/count/", views.unapproved_user_count),
     path("api/quotes/submitted/", views.submitted_unapproved_quotes),
     path('api/quotes/unapproved/count/', views.unapproved_quotes_count, name='unapproved-quotes-count'),
     path('api/quotes/unapproved/', views.unapproved_quotes, name='unapproved-quotes'),
     path('api/signatures/submit/', views.submit_signature, name='submit-signature'),
+    path('api/signatures/upload/', views.upload_signature, name='upload-signature'),
     path('api/signatures/refuse/', views.refuse_signature),
+    path('api/signatures/bulk/', views.bulk_signatures, name='bulk-signatures'),
     path('api/signatures/pending/', views.pending_signatures),
     path('api/signatures/pending/count/', views.pending_signatures_count),
+    path('api/counts/', views.all_counts, name='all-counts'),
+    path('api/events/', views.quote_events, name='quote-events'),
+    path('api/async/quotes/', views.async_quote_list, name='async-quote-list'),
+    path('api/async/quotes/<int:pk>/', views.async_quote_detail, name='async-quote-detail'),
+    path('api/async/counts/', views.async_all_counts, name='async-all-counts'),
     path('auth/logout/', LogoutView.as_view(), name='rest_logout'),
     path("api/test-auth/", views.test_auth),
+    path("api/renditions/<str:bucket>/<path:name>", views.image_rendition, name="image-rendition"),
     path('admin/', admin.site.urls),
     path('api/', include('quotes.urls')),            # ← Add this
     path('auth/', include('dj_rest_auth.urls')),     # ← Auth routes
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class QuotesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'quotes'
+
+    def ready(self):
+        from . import database  # registers the SQLite pragma hook
+        from . import perf  # registers the query recorder (QUOTEBOOK_PERF=1 only)
@@ -0,0 +1,96 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+ROLE_SUPERUSER = "superuser"
+ROLE_PARTICIPANT = "participant"
+ROLE_OTHER = "other"
+
+# Bumped when something every quote embeds changes (e.g. a user's name)
+GLOBAL_GENERATION_KEY = "quotes:gen"
+
+
+def quote_cache():
+    return caches[getattr(settings, "QUOTE_CACHE_ALIAS", "quotes")]
+
+
+def _entry_key(quote_id, version, generation, role, host):
+    return f"quote:{quote_id}:{version}:{generation}:{role}:{host}"
+
+
+def _new_generation():
+    # unique and increasing; a generation evicted by LRU can never come back
+    return time.time_ns()
+
+
+def global_generation():
+    cache = quote_cache()
+    generation = cache.get(GLOBAL_GENERATION_KEY)
+    if generation is None:
+        generation = _new_generation()
+        cache.set(GLOBAL_GENERATION_KEY, generation, timeout=None)
+    return generation
+
+
+def invalidate_all_quotes():
+    transaction.on_commit(lambda: quote_cache().set(
+        GLOBAL_GENERATION_KEY, _new_generation(), timeout=None
+    ))
+
+
+def viewer_roles(user, quote_ids):
+    from .models import Quote
+
+    if user.is_superuser:
+        return {pk: ROLE_SUPERUSER for pk in quote_ids}
+    participating = set(
+        Quote.participants.through.objects
+        .filter(quote_id__in=quote_ids, user_id=user.id)
+        .values_list("quote_id", flat=True)
+    )
+    return {pk: ROLE_PARTICIPANT if pk in participating else ROLE_OTHER for pk in quote_ids}
+
+
+def _personalize(entry, user):
+    """Fill in the two fields that depend on the individual viewer, not just the role."""
+    data = dict(entry["data"])
+    data["user_rarity_vote"] = next(
+        (rarity for rarity, voters in data["rank_votes"].items() if any(v["id"] == user.id for v in voters)),
+        None,
+    )
+    data["has_flagged"] = user.id in entry["flagger_ids"]
+    return data
+
+
+def render_quotes(quotes, request, serialize):
+    """
+    Representations of `quotes` for the requesting user, in order. Cached
+    entries are reused per (quote, version, role); only the misses are
+    loaded with `serialize(quote_ids) -> [(quote, data), ...]`.
+    """
+    if not quotes:
+        return []
+    user = request.user
+    ids = [q.pk for q in quotes]
+    host = request.get_host()
+    roles = viewer_roles(user, ids)
+    generation = global_generation()
+    keys = {q.pk: _entry_key(q.pk, q.version, generation, roles[q.pk], host) for q in quotes}
+
+    cache = quote_cache()
+    found = cache.get_many(keys.values())
+    entries = {pk: found[key] for pk, key in keys.items() if key in found}
+
+    misses = [pk for pk in ids if pk not in entries]
+    if misses:
+        fresh = {}
+        for quote, data in serialize(misses):
+            entry = {"data": data, "flagger_ids": [u.id for u in quote.flagged_by.all()]}
+            entries[quote.pk] = entry
+            fresh[keys[quote.pk]] = entry
+        cache.set_many(fresh)
+
+    return [_personalize(entries[pk], user) for pk in ids if pk in entries]
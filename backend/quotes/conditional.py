@@ -0,0 +1,44 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .cache import global_generation
+
+
+def quotes_etag(request, quotes, scope=""):
+    """
+    Strong ETag for the representation of `quotes` as the requesting user
+    sees it: their ids and versions, plus everything else the body depends on.
+    """
+    digest = hashlib.sha1(
+        f"{global_generation()}|{request.user.pk}|{request.get_host()}|{scope}".encode()
+    )
+    for quote in quotes:
+        digest.update(f"|{quote.pk}:{quote.version}".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def last_modified(quotes):
+    """
+    Last-Modified for a single quote. Lists must not use it: the newest stamp
+    on a page stays the same when another quote is deleted or hidden.
+    """
+    stamps = [q.updated_at for q in quotes if q.updated_at]
+    # whole seconds, the resolution of an HTTP date
+    return int(max(stamps).timestamp()) if stamps else None
+
+
+def not_modified(request, etag, modified):
+    """304 response if the client's validators still match, else None."""
+    response = get_conditional_response(request, etag=etag, last_modified=modified)
+    if response is not None:
+        set_validators(response, etag, modified)
+    return response
+
+
+def set_validators(response, etag, modified):
+    response["ETag"] = etag
+    if modified is not None:
+        response["Last-Modified"] = http_date(modified)
+    return response
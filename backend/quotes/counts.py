@@ -0,0 +1,110 @@
+from django.db.models import Count, Exists, OuterRef, Q
+
+from .models import AccountRequest, Quote, QuoteRankVote, Signature
+from .queries import has_responded, has_voted, participates
+
+
+def _badge_count_query(user):
+    aggregates = {
+        "unrated_quotes": Count(
+            "pk", filter=Q(approved=True, visible=True, has_voted=False)
+        ),
+        "pending_signatures": Count(
+            "pk", filter=Q(approved=True, is_participant=True, has_responded=False)
+        ),
+    }
+    if user.is_superuser:
+        aggregates["flagged_quotes"] = Count("pk", filter=Q(is_flagged=True))
+        aggregates["unapproved_quotes"] = Count("pk", filter=Q(approved=False))
+
+    queryset = Quote.objects.alias(
+        has_voted=Exists(has_voted(user)),
+        is_participant=Exists(participates(user)),
+        has_responded=Exists(has_responded(user)),
+    )
+    return queryset, aggregates
+
+
+def badge_counts(user):
+    """
+    All navigation badge counts the user is allowed to see, computed with
+    conditional aggregation: one query over quotes, plus one over account
+    requests for superusers.
+    """
+    queryset, aggregates = _badge_count_query(user)
+    counts = queryset.aggregate(**aggregates)
+
+    if user.is_superuser:
+        counts["unapproved_users"] = AccountRequest.objects.filter(approved=False).count()
+
+    return counts
+
+
+async def abadge_counts(user):
+    """Async version of badge_counts."""
+    queryset, aggregates = _badge_count_query(user)
+    counts = await queryset.aaggregate(**aggregates)
+
+    if user.is_superuser:
+        counts["unapproved_users"] = await AccountRequest.objects.filter(approved=False).acount()
+
+    return counts
+
+
+def live_updates(quote_ids, users):
+    """
+    What every open event stream needs after `quote_ids` changed, computed with
+    a fixed number of queries however many streams are open. `users` maps
+    user id → is_superuser; returns {user_id: (badge counts, visible changed ids)}
+    with the same counts badge_counts() gives and the same visibility as
+    visible_quotes() (admins also hear about unapproved quotes).
+    """
+    user_ids = list(users)
+    any_admin = any(users.values())
+
+    aggregates = {"public": Count("pk", filter=Q(approved=True, visible=True))}
+    if any_admin:
+        aggregates["flagged_quotes"] = Count("pk", filter=Q(is_flagged=True))
+        aggregates["unapproved_quotes"] = Count("pk", filter=Q(approved=False))
+    totals = Quote.objects.aggregate(**aggregates)
+    if any_admin:
+        totals["unapproved_users"] = AccountRequest.objects.filter(approved=False).count()
+
+    # unrated = public quotes minus the ones the user voted on (one vote per user and quote)
+    voted = dict(
+        QuoteRankVote.objects.filter(user_id__in=user_ids, quote__approved=True, quote__visible=True)
+        .values_list("user_id").annotate(n=Count("*")).order_by()
+    )
+    responded = Signature.objects.filter(quote_id=OuterRef("quote_id"), user_id=OuterRef("user_id"))
+    pending = dict(
+        Quote.participants.through.objects.filter(user_id__in=user_ids, quote__approved=True)
+        .filter(~Exists(responded))
+        .values_list("user_id").annotate(n=Count("*")).order_by()
+    )
+
+    existing, public, participating = set(), set(), {}
+    if quote_ids:
+        for pk, approved, visible in Quote.objects.filter(pk__in=quote_ids).values_list("pk", "approved", "visible"):
+            existing.add(pk)
+            if approved and visible:
+                public.add(pk)
+            elif approved:
+                participating[pk] = set()
+        rows = Quote.participants.through.objects.filter(quote_id__in=list(participating), user_id__in=user_ids)
+        for quote_id, user_id in rows.values_list("quote_id", "user_id"):
+            participating[quote_id].add(user_id)
+
+    updates = {}
+    for user_id, is_superuser in users.items():
+        counts = {
+            "unrated_quotes": totals["public"] - voted.get(user_id, 0),
+            "pending_signatures": pending.get(user_id, 0),
+        }
+        if is_superuser:
+            for key in ("flagged_quotes", "unapproved_quotes", "unapproved_users"):
+                counts[key] = totals[key]
+            ids = existing
+        else:
+            ids = public | {pk for pk, members in participating.items() if user_id in members}
+        updates[user_id] = (counts, sorted(ids))
+    return updates
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import logging
+import threading
+
+from asgiref.sync import sync_to_async
+from django.db import connection, transaction
+
+# Live-update hub: writers publish the ids of changed quotes, every open
+# /api/events/ stream gets its own queue. The hub lives in this process, so
+# run the ASGI server with a single worker (or pin event streams to one).
+#
+# Publishes are coalesced per event loop and answered with one round of
+# queries for all open streams (see counts.live_updates); each stream then
+# receives its own (counts, visible ids) pair without touching the database.
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SIZE = 256
+COALESCE_SECONDS = 0.25
+
+_subscribers = set()
+_lock = threading.Lock()
+_state = threading.local()
+# event loop → quote ids published since its last flush
+_pending = {}
+# running flush tasks, referenced so they aren't garbage-collected mid-flight
+_flushes = set()
+
+
+class Subscription:
+    def __init__(self, user):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.user_id = user.pk
+        self.is_superuser = user.is_superuser
+
+    def deliver(self, update):
+        try:
+            self.queue.put_nowait(update)
+        except asyncio.QueueFull:
+            # a stalled client only needs to know something changed; None means "resync"
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+def subscribe(user):
+    subscription = Subscription(user)
+    with _lock:
+        _subscribers.add(subscription)
+    return subscription
+
+
+def unsubscribe(subscription):
+    with _lock:
+        _subscribers.discard(subscription)
+
+
+def publish(quote_ids):
+    """
+    Queue `quote_ids` for every open stream; safe to call from any thread.
+    An empty set only refreshes the admins' badges (e.g. account requests).
+    """
+    with _lock:
+        loops = {subscription.loop for subscription in _subscribers}
+        scheduled = []
+        for loop in loops:
+            if loop not in _pending:
+                _pending[loop] = set()
+                scheduled.append(loop)
+            _pending[loop].update(quote_ids)
+    for loop in scheduled:
+        try:
+            loop.call_soon_threadsafe(_start_flush, loop)
+        except RuntimeError:
+            # event loop already closed; its streams' finally blocks will unsubscribe
+            with _lock:
+                _pending.pop(loop, None)
+
+
+def _start_flush(loop):
+    task = loop.create_task(_flush(loop))
+    _flushes.add(task)
+    task.add_done_callback(_flushes.discard)
+
+
+async def _flush(loop):
+    # let a burst of writes settle, then answer all of it with one round of queries
+    await asyncio.sleep(COALESCE_SECONDS)
+    with _lock:
+        quote_ids = _pending.pop(loop, set())
+        audience = [s for s in _subscribers if s.loop is loop and (quote_ids or s.is_superuser)]
+    if not audience:
+        return
+
+    from .counts import live_updates
+
+    users = {subscription.user_id: subscription.is_superuser for subscription in audience}
+    try:
+        updates = await sync_to_async(live_updates)(quote_ids, users)
+    except Exception:
+        logger.exception("Could not compute live updates; asking streams to resync")
+        updates = {}
+    for subscription in audience:
+        subscription.deliver(updates.get(subscription.user_id))
+
+
+def notify_quotes_changed(quote_ids=()):
+    """
+    Publish `quote_ids` once the current transaction commits, coalescing every
+    change made inside it. An empty set still tells admins to recount badges.
+    """
+    if not _subscribers:
+        return
+    if not connection.in_atomic_block:
+        publish(quote_ids)
+        return
+    if getattr(_state, "pending", None) is None:
+        _state.pending = set()
+    _state.pending.update(quote_ids)
+    # every callback drains the whole set, so all but the first are no-ops
+    transaction.on_commit(_flush_pending)
+
+
+def _flush_pending():
+    pending = getattr(_state, "pending", None)
+    _state.pending = None
+    if pending is not None:
+        publish(pending)
+
+
+def format_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
@@ -0,0 +1,82 @@
+import io
+import logging
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .storage import image_storage
+
+
+logger = logging.getLogger(__name__)
+
+# Transparent margin kept around the ink after cropping
+INK_PADDING = 4
+# Colours kept when quantizing; anti-aliased pen strokes need a few greys
+PALETTE_COLORS = 16
+
+
+def _ink_bbox(img):
+    """Bounding box of everything that is not background."""
+    if img.mode == "RGBA":
+        return img.getchannel("A").getbbox()
+    # opaque uploads (e.g. JPEG): treat white as the background
+    return ImageOps.invert(img.convert("L")).getbbox()
+
+
+def compress_signature(fieldfile):
+    """
+    Crop a signature image to its ink, reduce it to a small palette and
+    re-encode it without metadata. Returns (ContentFile, original_bytes,
+    stored_bytes), or None if the upload is not a readable image.
+    """
+    fieldfile.seek(0)
+    raw = fieldfile.read()
+    try:
+        img = Image.open(io.BytesIO(raw))
+        img.load()
+    except (UnidentifiedImageError, OSError):
+        logger.warning("Signature %s is not a readable image; stored as uploaded", fieldfile.name)
+        return None
+
+    img = img.convert("RGBA") if "A" in img.getbands() or img.mode == "P" else img.convert("RGB")
+
+    bbox = _ink_bbox(img)
+    if bbox:
+        left, top, right, bottom = bbox
+        img = img.crop((
+            max(left - INK_PADDING, 0),
+            max(top - INK_PADDING, 0),
+            min(right + INK_PADDING, img.width),
+            min(bottom + INK_PADDING, img.height),
+        ))
+
+    out = io.BytesIO()
+    fmt = getattr(settings, "SIGNATURE_INGEST_FORMAT", "png").lower()
+    if fmt == "webp":
+        img.save(out, format="WEBP", lossless=True, method=6)
+    else:
+        fmt = "png"
+        img = img.quantize(colors=PALETTE_COLORS, method=Image.Quantize.FASTOCTREE)
+        # no pnginfo/exif passed → text chunks and EXIF are dropped
+        img.save(out, format="PNG", optimize=True)
+
+    stem = os.path.splitext(os.path.basename(fieldfile.name))[0]
+    compressed = ContentFile(out.getvalue(), name=f"{stem}.{fmt}")
+    return compressed, len(raw), compressed.size
+
+
+def store_shared_signature(upload):
+    """
+    Compress `upload` and store it once for any number of signature rows.
+    Returns (name, original_bytes, stored_bytes), or None if the upload is
+    not a readable image.
+    """
+    result = compress_signature(upload)
+    if result is None:
+        return None
+    compressed, original_bytes, stored_bytes = result
+    # content-addressed: the same signature submitted again reuses its blob
+    name = image_storage.save(f"signatures/{compressed.name}", compressed)
+    return name, original_bytes, stored_bytes
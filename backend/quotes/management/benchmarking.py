@@ -0,0 +1,22 @@
+import contextlib
+
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from quotes.stats import percentile  # noqa: F401  re-exported for the bench commands
+
+
+@contextlib.contextmanager
+def scratch_database():
+    """
+    Run the block against a throwaway test database (in-memory for SQLite),
+    so benchmarks can seed data without touching the real one.
+    """
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
@@ -0,0 +1,107 @@
+# quotes/management/commands/bench_async_views.py
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client
+
+from quotes.management.benchmarking import percentile, scratch_database
+from quotes.models import Quote, QuoteLine
+
+ENDPOINTS = [
+    # (name, sync url, async url)
+    ("list", "/api/quotes/", "/api/async/quotes/"),
+    ("detail", "/api/quotes/{id}/", "/api/async/quotes/{id}/"),
+    ("counts", "/api/counts/", "/api/async/counts/"),
+]
+
+
+class Command(BaseCommand):
+    help = 'Compare throughput and latency of the sync (WSGI) and async (ASGI) read endpoints on a scratch database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quotes', type=int, default=500, help='Quotes to seed')
+        parser.add_argument('--users', type=int, default=20, help='Users to seed')
+        parser.add_argument('--requests', type=int, default=300, help='Requests per endpoint and path')
+        parser.add_argument('--concurrency', type=int, default=16, help='Requests in flight at once')
+
+    def handle(self, *args, **options):
+        with scratch_database():
+            user, quote_ids = self.seed(options['quotes'], options['users'])
+
+            self.stdout.write(f"{'endpoint':<10} {'path':<6} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+            for name, sync_url, async_url in ENDPOINTS:
+                urls = [u.format(id=quote_ids[i % len(quote_ids)]) for u in (sync_url, async_url)
+                        for i in range(options['requests'])]
+                sync_urls, async_urls = urls[:options['requests']], urls[options['requests']:]
+
+                caches['quotes'].clear()
+                self.report(name, "wsgi", *self.run_sync(user, sync_urls, options['concurrency']))
+                caches['quotes'].clear()
+                self.report(name, "asgi", *asyncio.run(self.run_async(user, async_urls, options['concurrency'])))
+
+    def seed(self, quote_count, user_count):
+        users = User.objects.bulk_create(
+            User(username=f"bench{i}", email=f"bench{i}@example.com") for i in range(user_count)
+        )
+        author = users[0]
+        quotes = Quote.objects.bulk_create(
+            Quote(created_by=author, approved=True, visible=i % 5 != 0) for i in range(quote_count)
+        )
+        QuoteLine.objects.bulk_create(
+            QuoteLine(quote=q, speaker_name=f"Speaker {j}", text=f"Line {j} of quote {i}")
+            for i, q in enumerate(quotes) for j in range(3)
+        )
+        through = Quote.participants.through
+        through.objects.bulk_create(
+            through(quote_id=q.pk, user_id=users[(i + k) % user_count].pk)
+            for i, q in enumerate(quotes) for k in range(2)
+        )
+        visible = [q.pk for q in quotes if q.visible]
+        return author, visible
+
+    def run_sync(self, user, urls, concurrency):
+        # log in once; concurrent session writes would lock SQLite's shared in-memory DB
+        login = Client()
+        login.force_login(user)
+
+        def worker(chunk):
+            client = Client()
+            client.cookies = login.cookies
+            timings = []
+            for url in chunk:
+                start = time.perf_counter()
+                client.get(url)
+                timings.append(time.perf_counter() - start)
+            return timings
+
+        chunks = [urls[i::concurrency] for i in range(concurrency)]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            timings = [t for chunk in pool.map(worker, chunks) for t in chunk]
+        return timings, time.perf_counter() - start
+
+    async def run_async(self, user, urls, concurrency):
+        client = AsyncClient()
+        await client.aforce_login(user)
+        gate = asyncio.Semaphore(concurrency)
+        timings = []
+
+        async def fetch(url):
+            async with gate:
+                start = time.perf_counter()
+                await client.get(url)
+                timings.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(fetch(url) for url in urls))
+        return timings, time.perf_counter() - start
+
+    def report(self, name, path, timings, elapsed):
+        self.stdout.write(
+            f"{name:<10} {path:<6} {len(timings) / elapsed:>9.1f} "
+            f"{percentile(timings, 50) * 1000:>9.1f} {percentile(timings, 99) * 1000:>9.1f}"
+        )
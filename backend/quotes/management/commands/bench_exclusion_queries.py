@@ -0,0 +1,111 @@
+# quotes/management/commands/bench_exclusion_queries.py
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from quotes.management.benchmarking import percentile, scratch_database
+from quotes.models import Quote, QuoteRankVote, Signature, counter_expressions
+from quotes.queries import pending_signature_quotes, unrated_quotes, visible_quotes
+
+
+def legacy_visible(user):
+    return Quote.objects.filter(approved=True).filter(Q(visible=True) | Q(participants=user)).distinct()
+
+
+def legacy_unrated(user):
+    return Quote.objects.filter(approved=True, visible=True).exclude(rank_votes__user=user).distinct()
+
+
+def legacy_pending(user):
+    return Quote.objects.filter(approved=True, participants=user).exclude(signatures__user=user).distinct()
+
+
+QUERIES = [
+    # (name, join + DISTINCT form, EXISTS form)
+    ("visible", legacy_visible, visible_quotes),
+    ("unrated", legacy_unrated, unrated_quotes),
+    ("pending", legacy_pending, pending_signature_quotes),
+]
+
+
+class Command(BaseCommand):
+    help = 'Compare the join+DISTINCT and EXISTS forms of the per-user quote filters on a seeded scratch database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quotes', type=int, default=50000)
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--runs', type=int, default=20, help='Timed runs per query form')
+        parser.add_argument('--explain', action='store_true', help='Print both query plans')
+
+    def handle(self, *args, **options):
+        with scratch_database():
+            started = time.perf_counter()
+            users = self.seed(options['quotes'], options['users'])
+            self.stdout.write(f"Seeded {options['quotes']} quotes / {options['users']} users "
+                              f"in {time.perf_counter() - started:.1f}s")
+
+            rng = random.Random(7)
+            self.stdout.write(f"{'query':<9} {'form':<8} {'count p50':>10} {'count p99':>10} "
+                              f"{'page p50':>10} {'page p99':>10}  (ms)")
+            for name, legacy, current in QUERIES:
+                sample = [rng.choice(users) for _ in range(options['runs'])]
+                for form, build in (("distinct", legacy), ("exists", current)):
+                    counts, pages = self.time(build, sample)
+                    self.stdout.write(
+                        f"{name:<9} {form:<8} {percentile(counts, 50):>10.1f} {percentile(counts, 99):>10.1f} "
+                        f"{percentile(pages, 50):>10.1f} {percentile(pages, 99):>10.1f}"
+                    )
+                    if options['explain']:
+                        page = build(sample[0]).order_by("-created_at", "-id")[:25]
+                        self.stdout.write(page.explain())
+
+                # both forms must select the same quotes
+                user = sample[0]
+                if set(legacy(user).values_list("pk", flat=True)) != set(current(user).values_list("pk", flat=True)):
+                    self.stderr.write(self.style.ERROR(f"{name}: forms disagree for {user.username}"))
+
+    def time(self, build, users):
+        counts, pages = [], []
+        for user in users:
+            start = time.perf_counter()
+            build(user).count()
+            counts.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            list(build(user).order_by("-created_at", "-id")[:25])
+            pages.append((time.perf_counter() - start) * 1000)
+        return counts, pages
+
+    def seed(self, quote_count, user_count):
+        rng = random.Random(42)
+        users = User.objects.bulk_create(
+            User(username=f"bench{i}", email=f"bench{i}@example.com") for i in range(user_count)
+        )
+        now = timezone.now()
+        quotes = Quote.objects.bulk_create(
+            (Quote(created_by=rng.choice(users), approved=rng.random() < 0.9, visible=rng.random() < 0.7,
+                   approved_at=now) for _ in range(quote_count)),
+            batch_size=2000,
+        )
+
+        through = Quote.participants.through
+        participants, votes, signatures = [], [], []
+        for quote in quotes:
+            for user in rng.sample(users, rng.randint(1, 4)):
+                participants.append(through(quote_id=quote.pk, user_id=user.pk))
+                if rng.random() < 0.6:
+                    signatures.append(Signature(quote=quote, user=user, refused=rng.random() < 0.1))
+            for user in rng.sample(users, rng.randint(0, 6)):
+                votes.append(QuoteRankVote(quote=quote, user=user, rarity="common"))
+
+        through.objects.bulk_create(participants, batch_size=5000)
+        Signature.objects.bulk_create(signatures, batch_size=5000)
+        QuoteRankVote.objects.bulk_create(votes, batch_size=5000)
+
+        # bulk_create skips the signals that maintain the counters the current filters gate on
+        Quote.objects.update(**counter_expressions())
+        return users
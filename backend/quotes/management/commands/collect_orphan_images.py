@@ -0,0 +1,59 @@
+# quotes/management/commands/collect_orphan_images.py
+import os
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from quotes.models import IMAGE_FIELDS
+from quotes.renditions import RENDITION_DIRS, is_rendition
+
+
+def original_of(rendition):
+    """signatures/abc.sm.png → signatures/abc.png"""
+    stem, ext = os.path.splitext(rendition)
+    return os.path.splitext(stem)[0] + ext
+
+
+class Command(BaseCommand):
+    help = 'Delete image files (and their renditions) in signatures/ and quote_sources/ that no row references'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='List the orphans without deleting them')
+        parser.add_argument('--min-age', type=int, default=60,
+                            help='Skip files younger than this many minutes; their row may not be committed yet')
+
+    def handle(self, *args, **options):
+        referenced = set()
+        for model, field in IMAGE_FIELDS:
+            referenced.update(
+                model.objects.exclude(**{f"{field}__isnull": True}).exclude(**{field: ""})
+                .values_list(field, flat=True).iterator()
+            )
+
+        cutoff = timezone.now() - timedelta(minutes=options['min_age'])
+        orphans, reclaimed = 0, 0
+        for directory in RENDITION_DIRS:
+            if not default_storage.exists(directory):
+                continue
+            for filename in default_storage.listdir(directory)[1]:
+                name = f"{directory}{filename}"
+                if name in referenced:
+                    continue
+                # a rendition lives exactly as long as its original
+                if is_rendition(name) and original_of(name) in referenced:
+                    continue
+                if default_storage.get_modified_time(name) > cutoff:
+                    continue
+
+                size = default_storage.size(name)
+                orphans += 1
+                reclaimed += size
+                if options['dry_run']:
+                    self.stdout.write(f"would delete {name} ({size} bytes)")
+                else:
+                    default_storage.delete(name)
+
+        verb = "Would reclaim" if options['dry_run'] else "Reclaimed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {orphans} orphaned files, {reclaimed} bytes"))
@@ -0,0 +1,186 @@
+# quotes/management/commands/copy_from_sqlite.py
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.db.models import Count, Max, Min
+
+from quotes.cache import invalidate_all_quotes
+from quotes.models import Quote, UserNameKey
+from quotes.search import reindex_quotes
+
+SOURCE_ALIAS = "sqlite_source"
+
+# Parents before children. Apps that aren't installed are skipped.
+COPY_ORDER = [
+    "auth.User",
+    "account.EmailAddress",
+    "authtoken.Token",
+    "quotes.AccountRequest",
+    "quotes.Quote",
+    "quotes.Quote_participants",
+    "quotes.Quote_flagged_by",
+    "quotes.QuoteLine",
+    "quotes.Signature",
+    "quotes.QuoteRankVote",
+    "django_apscheduler.DjangoJob",
+    "django_apscheduler.DjangoJobExecution",
+]
+
+
+def copied_models():
+    models = []
+    for label in COPY_ORDER:
+        try:
+            models.append(apps.get_model(label))
+        except LookupError:
+            continue
+    return models
+
+
+@contextmanager
+def original_timestamps(model):
+    """
+    Switch off auto_now / auto_now_add on `model` for the block: bulk_create
+    runs pre_save(add=True), which would stamp every copied row with the current time.
+    """
+    fields = [f for f in model._meta.concrete_fields
+              if isinstance(f, models.DateField) and (f.auto_now or f.auto_now_add)]
+    saved = [(f, f.auto_now, f.auto_now_add) for f in fields]
+    for f in fields:
+        f.auto_now = f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f, auto_now, auto_now_add in saved:
+            f.auto_now, f.auto_now_add = auto_now, auto_now_add
+
+
+def fingerprint(model, alias):
+    """Row count plus min/max of the primary key and every date column, to catch rewritten values."""
+    aggregates = {"rows": Count("*"), "pk_min": Min("pk"), "pk_max": Max("pk")}
+    for f in model._meta.concrete_fields:
+        if isinstance(f, models.DateField):
+            aggregates[f"{f.name}_min"] = Min(f.name)
+            aggregates[f"{f.name}_max"] = Max(f.name)
+    return model._base_manager.using(alias).aggregate(**aggregates)
+
+
+class Command(BaseCommand):
+    help = ('Copy users, quotes and scheduler jobs from an SQLite file into the configured database, '
+            'in batches, then verify row counts and timestamp ranges')
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='Path to the SQLite file, migrated to the current schema')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Target database alias')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows read and inserted at a time')
+
+    def handle(self, *args, **options):
+        path = Path(options['source'])
+        if not path.is_file():
+            raise CommandError(f"{path} does not exist")
+        target = options['database']
+        batch_size = options['batch_size']
+
+        self.register_source(path)
+        try:
+            models = copied_models()
+            self.check_schemas(models, target)
+
+            with transaction.atomic(using=target):
+                for model in models:
+                    copied = self.copy(model, target, batch_size)
+                    self.stdout.write(f"{model._meta.label:<40} {copied:>9} rows")
+                self.rebuild_name_keys(target, batch_size)
+                self.reset_sequences(models + [UserNameKey], target)
+                self.verify(models, target)
+                if target == DEFAULT_DB_ALIAS:
+                    invalidate_all_quotes()
+        finally:
+            connections[SOURCE_ALIAS].close()
+
+        if target == DEFAULT_DB_ALIAS and connections[target].vendor == "sqlite":
+            # the FTS table is filled by signals, which bulk inserts skip
+            ids = list(Quote.objects.values_list("pk", flat=True))
+            for start in range(0, len(ids), batch_size):
+                reindex_quotes(ids[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS("Copy complete; row counts and timestamp ranges match"))
+
+    def register_source(self, path):
+        database = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(path)}
+        configured = connections.configure_settings({**settings.DATABASES, SOURCE_ALIAS: database})
+        connections.settings[SOURCE_ALIAS] = configured[SOURCE_ALIAS]
+
+    def check_schemas(self, models, target):
+        source = connections[SOURCE_ALIAS]
+        tables = set(source.introspection.table_names())
+        with source.cursor() as cursor:
+            for model in models:
+                table = model._meta.db_table
+                if table not in tables:
+                    continue
+                present = {col.name for col in source.introspection.get_table_description(cursor, table)}
+                missing = [f.column for f in model._meta.concrete_fields if f.column not in present]
+                if missing:
+                    raise CommandError(
+                        f"{table} in the source lacks {', '.join(missing)}; "
+                        f"run `manage.py migrate` against the SQLite file first"
+                    )
+                if model._default_manager.using(target).exists():
+                    raise CommandError(f"{table} already has rows in '{target}'; copy into a fresh database")
+
+    def copy(self, model, target, batch_size):
+        if model._meta.db_table not in connections[SOURCE_ALIAS].introspection.table_names():
+            return 0
+        rows = model._base_manager.using(SOURCE_ALIAS).order_by("pk").iterator(chunk_size=batch_size)
+        manager = model._base_manager.using(target)
+
+        copied, batch = 0, []
+        with original_timestamps(model):
+            for row in rows:
+                batch.append(row)
+                if len(batch) == batch_size:
+                    manager.bulk_create(batch)
+                    copied += len(batch)
+                    batch = []
+            if batch:
+                manager.bulk_create(batch)
+                copied += len(batch)
+        return copied
+
+    def rebuild_name_keys(self, target, batch_size):
+        # derived from users, so rebuilt rather than copied
+        User = apps.get_model("auth", "User")
+        users = User.objects.using(target).only("username", "first_name", "last_name")
+        UserNameKey.objects.using(target).bulk_create(
+            (UserNameKey(user_id=user.pk, **UserNameKey.keys_for(user))
+             for user in users.iterator(chunk_size=batch_size)),
+            batch_size=batch_size,
+        )
+
+    def reset_sequences(self, models, target):
+        connection = connections[target]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def verify(self, models, target):
+        tables = set(connections[SOURCE_ALIAS].introspection.table_names())
+        mismatched = []
+        for model in models:
+            if model._meta.db_table not in tables:
+                continue
+            expected = fingerprint(model, SOURCE_ALIAS)
+            actual = fingerprint(model, target)
+            for key, value in expected.items():
+                if actual[key] != value:
+                    mismatched.append(f"{model._meta.label} {key}: {value} in source, {actual[key]} copied")
+        if mismatched:
+            raise CommandError("Copied tables differ, nothing was committed:\n" + "\n".join(mismatched))
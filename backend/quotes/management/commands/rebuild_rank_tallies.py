@@ -0,0 +1,49 @@
+# quotes/management/commands/rebuild_rank_tallies.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from quotes.models import (
+    Quote, QuoteRankVote, RARITY_ORDER, TALLY_FIELDS, mark_quotes_changed, rank_from_tally, tally_field,
+)
+
+
+class Command(BaseCommand):
+    help = 'Recount the per-rarity vote tallies and ranks of every quote from QuoteRankVote rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report quotes whose stored tallies drifted, without fixing them',
+        )
+
+    def handle(self, *args, **options):
+        tallies = {}
+        rows = QuoteRankVote.objects.values_list('quote_id', 'rarity').annotate(n=Count('id')).order_by()
+        for quote_id, rarity, n in rows:
+            tallies.setdefault(quote_id, {})[rarity] = n
+
+        drifted = []
+        for quote in Quote.objects.only('id', 'rank', *TALLY_FIELDS).iterator(chunk_size=1000):
+            counts = tallies.get(quote.pk, {})
+            expected = {tally_field(r): counts.get(r, 0) for r in RARITY_ORDER}
+            expected_rank = rank_from_tally(counts)
+            stored = {field: getattr(quote, field) for field in TALLY_FIELDS}
+            if stored != expected or quote.rank != expected_rank:
+                for field, value in expected.items():
+                    setattr(quote, field, value)
+                quote.rank = expected_rank
+                drifted.append(quote)
+
+        if options['check']:
+            for quote in drifted:
+                self.stdout.write(f"Quote #{quote.pk} tally out of date")
+            self.stdout.write(f"{len(drifted)} quote(s) with drifted tallies")
+            return
+
+        with transaction.atomic():
+            Quote.objects.bulk_update(drifted, ['rank', *TALLY_FIELDS], batch_size=500)
+            mark_quotes_changed([quote.pk for quote in drifted])
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt tallies for {len(drifted)} quote(s)"))
@@ -0,0 +1,41 @@
+# quotes/management/commands/reconcile_quote_counters.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Q
+
+from quotes.models import COUNTER_FIELDS, Quote, counter_expressions, mark_quotes_changed
+
+
+class Command(BaseCommand):
+    help = 'Recount the flag, vote and signature counter columns of every quote from their rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report quotes whose stored counters drifted, without fixing them',
+        )
+
+    def handle(self, *args, **options):
+        expected = {f"expected_{field}": expr for field, expr in counter_expressions().items()}
+        drift = Q()
+        for field in COUNTER_FIELDS:
+            drift |= ~Q(**{field: F(f"expected_{field}")})
+        rows = Quote.objects.annotate(**expected).filter(drift).values("pk", *COUNTER_FIELDS, *expected)
+        drifted = list(rows)
+
+        if options['check']:
+            for row in drifted:
+                changes = ", ".join(
+                    f"{field} {row[field]} → {row[f'expected_{field}']}"
+                    for field in COUNTER_FIELDS if row[field] != row[f"expected_{field}"]
+                )
+                self.stdout.write(f"Quote #{row['pk']}: {changes}")
+            self.stdout.write(f"{len(drifted)} quote(s) with drifted counters")
+            return
+
+        with transaction.atomic():
+            # recounts the counters as part of the version bump
+            mark_quotes_changed([row["pk"] for row in drifted])
+
+        self.stdout.write(self.style.SUCCESS(f"Reconciled counters for {len(drifted)} quote(s)"))
@@ -0,0 +1,127 @@
+# quotes/management/commands/stress_sqlite.py
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from quotes.management.benchmarking import percentile
+from quotes.models import RARITY_ORDER, Quote, QuoteRankVote, Signature, tally_field
+
+PROFILES = {
+    # what DATABASES['default'] looks like without QUOTEBOOK_DB_PROFILE
+    "baseline": {},
+    "production": settings.SQLITE_PRODUCTION_PROFILE,
+}
+
+
+class Command(BaseCommand):
+    help = 'Hammer a scratch SQLite file with concurrent votes and signatures under each database profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', choices=[*PROFILES, 'both'], default='both')
+        parser.add_argument('--threads', type=int, default=16, help='Concurrent writers')
+        parser.add_argument('--seconds', type=float, default=10, help='Duration per profile')
+        parser.add_argument('--quotes', type=int, default=200, help='Quotes to seed')
+        parser.add_argument('--users', type=int, default=50, help='Users to seed')
+
+    def handle(self, *args, **options):
+        names = list(PROFILES) if options['profile'] == 'both' else [options['profile']]
+
+        self.stdout.write(f"{'profile':<11} {'writes/s':>9} {'writes':>8} {'locked':>7} "
+                          f"{'lock %':>7} {'p99 ms':>8} {'other':>6}")
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in names:
+                alias = f"stress_{name}"
+                self.register(alias, Path(tmp) / f"{name}.sqlite3", PROFILES[name])
+                try:
+                    # only quotes and its dependencies; some third-party data migrations ignore the alias
+                    call_command('migrate', 'quotes', database=alias, verbosity=0)
+                    quote_ids, user_ids = self.seed(alias, options['quotes'], options['users'])
+                    stats = self.hammer(alias, quote_ids, user_ids, options['threads'], options['seconds'])
+                finally:
+                    connections[alias].close()
+                self.report(name, stats, options['seconds'])
+
+    def register(self, alias, path, profile):
+        database = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(path), **profile}
+        configured = connections.configure_settings({**settings.DATABASES, alias: database})
+        connections.settings[alias] = configured[alias]
+
+    def seed(self, alias, quote_count, user_count):
+        users = User.objects.using(alias).bulk_create(
+            User(username=f"stress{i}", email=f"stress{i}@example.com") for i in range(user_count)
+        )
+        quotes = Quote.objects.using(alias).bulk_create(
+            Quote(created_by=users[0], approved=True, visible=True, approved_at=timezone.now())
+            for _ in range(quote_count)
+        )
+        return [q.pk for q in quotes], [u.pk for u in users]
+
+    def hammer(self, alias, quote_ids, user_ids, threads, seconds):
+        deadline = time.monotonic() + seconds
+        stats = {"writes": 0, "locked": 0, "other": 0, "latency": []}
+        lock = threading.Lock()
+
+        def vote(rng):
+            # the vote_quote_rank pattern: read the old vote, upsert it, bump the tally
+            quote_id, user_id = rng.choice(quote_ids), rng.choice(user_ids)
+            rarity = rng.choice(RARITY_ORDER)
+            with transaction.atomic(using=alias):
+                QuoteRankVote.objects.using(alias).filter(quote_id=quote_id, user_id=user_id).first()
+                QuoteRankVote.objects.using(alias).bulk_create(
+                    [QuoteRankVote(quote_id=quote_id, user_id=user_id, rarity=rarity)],
+                    update_conflicts=True, unique_fields=["quote", "user"], update_fields=["rarity"],
+                )
+                Quote.objects.using(alias).filter(pk=quote_id).update(
+                    **{tally_field(rarity): F(tally_field(rarity)) + 1}, version=F("version") + 1
+                )
+
+        def refuse(rng):
+            Signature.objects.using(alias).bulk_create([
+                Signature(quote_id=rng.choice(quote_ids), guest_name=f"guest {rng.random()}", refused=True)
+            ])
+
+        def worker(seed):
+            rng = random.Random(seed)
+            local = {"writes": 0, "locked": 0, "other": 0, "latency": []}
+            try:
+                while time.monotonic() < deadline:
+                    start = time.perf_counter()
+                    try:
+                        (vote if rng.random() < 0.8 else refuse)(rng)
+                        local["writes"] += 1
+                        local["latency"].append(time.perf_counter() - start)
+                    except OperationalError as exc:
+                        local["locked" if "locked" in str(exc) else "other"] += 1
+                    # readers share the file too
+                    Quote.objects.using(alias).filter(approved=True).count()
+            finally:
+                connections[alias].close()
+                with lock:
+                    for key in ("writes", "locked", "other"):
+                        stats[key] += local[key]
+                    stats["latency"] += local["latency"]
+
+        pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        return stats
+
+    def report(self, name, stats, seconds):
+        attempts = stats["writes"] + stats["locked"] + stats["other"]
+        lock_rate = 100 * stats["locked"] / attempts if attempts else 0
+        self.stdout.write(
+            f"{name:<11} {stats['writes'] / seconds:>9.1f} {stats['writes']:>8} {stats['locked']:>7} "
+            f"{lock_rate:>6.2f}% {percentile(stats['latency'], 99) * 1000:>8.1f} {stats['other']:>6}"
+        )
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:02
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+RARITY_ORDER = ['common', 'uncommon', 'rare', 'epic', 'legendary']
+
+
+def fill_tallies(apps, schema_editor):
+    Quote = apps.get_model('quotes', 'Quote')
+    QuoteRankVote = apps.get_model('quotes', 'QuoteRankVote')
+    db = schema_editor.connection.alias
+
+    tallies = {}
+    rows = QuoteRankVote.objects.using(db).values_list('quote_id', 'rarity').annotate(n=Count('id')).order_by()
+    for quote_id, rarity, n in rows:
+        tallies.setdefault(quote_id, {})[rarity] = n
+
+    quotes = list(Quote.objects.using(db).filter(pk__in=tallies))
+    for quote in quotes:
+        for rarity in RARITY_ORDER:
+            setattr(quote, f'{rarity}_votes', tallies[quote.pk].get(rarity, 0))
+    Quote.objects.using(db).bulk_update(quotes, [f'{r}_votes' for r in RARITY_ORDER], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0014_signature_guest_name_alter_signature_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quote',
+            name='common_votes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='quote',
+            name='epic_votes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='quote',
+            name='legendary_votes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='quote',
+            name='rare_votes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='quote',
+            name='uncommon_votes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_tallies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def normalize_key(value):
+    return " ".join((value or "").strip().split()).lower()
+
+
+def fill_name_keys(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    UserNameKey = apps.get_model('quotes', 'UserNameKey')
+    db = schema_editor.connection.alias
+    UserNameKey.objects.using(db).bulk_create(
+        [
+            UserNameKey(
+                user_id=u.pk,
+                username_key=normalize_key(u.username),
+                full_name_key=normalize_key(f"{u.first_name} {u.last_name}"),
+            )
+            for u in User.objects.using(db).only('username', 'first_name', 'last_name').iterator()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('quotes', '0015_quote_rarity_vote_tallies'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserNameKey',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='name_key', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('username_key', models.CharField(db_index=True, max_length=150)),
+                ('full_name_key', models.CharField(blank=True, db_index=True, max_length=301)),
+            ],
+        ),
+        migrations.RunPython(fill_name_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0016_usernamekey'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='signature',
+            name='image_original_bytes',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='signature',
+            name='image_stored_bytes',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
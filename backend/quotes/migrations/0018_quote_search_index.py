@@ -0,0 +1,44 @@
+from django.db import migrations
+
+from quotes.search import FTS_TABLE, create_index, drop_index
+
+
+def build_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    create_index(schema_editor)
+
+    Quote = apps.get_model('quotes', 'Quote')
+    QuoteLine = apps.get_model('quotes', 'QuoteLine')
+    db = schema_editor.connection.alias
+
+    rows = {}
+    for pk, notes in Quote.objects.using(db).filter(redacted=False).values_list('pk', 'quote_notes'):
+        rows[pk] = ([], [], notes or '')
+    lines = QuoteLine.objects.using(db).filter(quote_id__in=rows).order_by('quote_id', 'id')
+    for quote_id, speaker, text in lines.values_list('quote_id', 'speaker_name', 'text'):
+        rows[quote_id][0].append(speaker)
+        rows[quote_id][1].append(text)
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, speakers, body, notes) VALUES (%s, %s, %s, %s)",
+            [(pk, '\n'.join(s), '\n'.join(b), n) for pk, (s, b, n) in rows.items()],
+        )
+
+
+def remove_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    drop_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0017_signature_image_sizes'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_index, remove_index),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0018_quote_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quote',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='quote',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0019_quote_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(condition=models.Q(('approved', True), ('visible', True)), fields=['-created_at'], name='quotes_quote_public_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(condition=models.Q(('approved', True)), fields=['approved_at'], name='quotes_quote_approved_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(fields=['created_by', 'approved'], name='quotes_quote_author_appr_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(condition=models.Q(('is_flagged', True)), fields=['is_flagged'], name='quotes_quote_flagged_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quoterankvote',
+            index=models.Index(fields=['user'], name='quotes_rankvote_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='signature',
+            index=models.Index(fields=['quote', 'user'], name='quotes_sig_quote_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='signature',
+            index=models.Index(condition=models.Q(('user__isnull', True)), fields=['quote', 'guest_name'], name='quotes_sig_quote_guest_idx'),
+        ),
+    ]
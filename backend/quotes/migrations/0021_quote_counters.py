@@ -0,0 +1,64 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:24
+
+from django.db import migrations, models
+from django.db.models import Count, Exists, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+def row_count(queryset, group):
+    return Coalesce(Subquery(queryset.order_by().values(group).annotate(n=Count('*')).values('n')), 0)
+
+
+def fill_counters(apps, schema_editor):
+    Quote = apps.get_model('quotes', 'Quote')
+    Signature = apps.get_model('quotes', 'Signature')
+    db = schema_editor.connection.alias
+
+    has_image = Q(signature_image__isnull=False) & ~Q(signature_image='')
+    answered = Signature.objects.filter(
+        Q(refused=True) | has_image, quote_id=OuterRef('quote_id'), user_id=OuterRef('user_id')
+    )
+    participants = Quote.participants.through.objects.filter(quote_id=OuterRef('pk'))
+    Quote.objects.using(db).update(
+        flag_count=row_count(Quote.flagged_by.through.objects.filter(quote_id=OuterRef('pk')), 'quote_id'),
+        vote_count=F('common_votes') + F('uncommon_votes') + F('rare_votes') + F('epic_votes') + F('legendary_votes'),
+        signed_count=row_count(Signature.objects.filter(has_image, quote=OuterRef('pk'), refused=False), 'quote'),
+        refused_count=row_count(Signature.objects.filter(quote=OuterRef('pk'), refused=True), 'quote'),
+        pending_count=row_count(participants.filter(~Exists(answered)), 'quote_id'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0020_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quote',
+            name='flag_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='quote',
+            name='pending_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='quote',
+            name='refused_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='quote',
+            name='signed_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='quote',
+            name='vote_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
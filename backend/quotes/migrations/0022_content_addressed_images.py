@@ -0,0 +1,34 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:30
+
+import quotes.storage
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0021_quote_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='quote',
+            name='quote_source_image',
+            field=models.ImageField(blank=True, null=True, storage=quotes.storage.ContentAddressedStorage(), upload_to='quote_sources/'),
+        ),
+        migrations.AlterField(
+            model_name='signature',
+            name='signature_image',
+            field=models.ImageField(blank=True, null=True, storage=quotes.storage.ContentAddressedStorage(), upload_to='signatures/'),
+        ),
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(fields=['quote_source_image'], name='quotes_quote_source_img_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='signature',
+            index=models.Index(fields=['signature_image'], name='quotes_sig_image_idx'),
+        ),
+    ]
@@ -1,8 +1,20 @@
-from django.db import models
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import models, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
-from django.db.models.signals import pre_delete
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
 from django.dispatch import receiver
-from collections import Counter
+from django.utils import timezone
+from .imaging import compress_signature
+from .renditions import delete_renditions
+from .storage import image_storage
+from .search import schedule_reindex
+from .cache import invalidate_all_quotes
+from .events import notify_quotes_changed
 
 
 RARITY_CHOICES = [
@@ -21,17 +33,190 @@ class QuoteRankVote(models.Model):
 
     class Meta:
         unique_together = ('quote', 'user')  # One vote per user per quote
+        indexes = [
+            # "which quotes has this user rated" without walking every quote's votes
+            models.Index(fields=['user'], name='quotes_rankvote_user_idx'),
+        ]
+
+RARITY_ORDER = [value for value, _ in RARITY_CHOICES]
+
+
+def mark_quotes_changed(quote_ids):
+    """
+    Move the version of `quote_ids` forward, which retires their cached
+    representations and ETags, recounts their counter columns and tells
+    live event streams about them. Signals call this for regular saves;
+    call it directly after writes that bypass them (queryset.update,
+    bulk_create).
+    """
+    quote_ids = [pk for pk in quote_ids if pk is not None]
+    if quote_ids:
+        Quote.objects.filter(pk__in=quote_ids).update(
+            version=F("version") + 1, updated_at=timezone.now(), **counter_expressions()
+        )
+        notify_quotes_changed(quote_ids)
+
+
+def tally_field(rarity):
+    """Name of the Quote column counting votes for `rarity`."""
+    return f"{rarity}_votes"
+
+
+TALLY_FIELDS = [tally_field(rarity) for rarity in RARITY_ORDER]
+
+
+COUNTER_FIELDS = ["flag_count", "vote_count", "signed_count", "refused_count", "pending_count"]
+
+
+def _row_count(queryset, group="quote"):
+    return Coalesce(Subquery(queryset.order_by().values(group).annotate(n=Count("*")).values("n")), 0)
+
+
+def counter_expressions():
+    """
+    Expressions recomputing every counter column of a quote from its rows,
+    for use in Quote.objects.update() or annotate().
+    """
+    has_image = Q(signature_image__isnull=False) & ~Q(signature_image="")
+    answered = Signature.objects.filter(
+        Q(refused=True) | has_image, quote_id=OuterRef("quote_id"), user_id=OuterRef("user_id")
+    )
+    participants = Quote.participants.through.objects.filter(quote_id=OuterRef("pk"))
+    return {
+        "flag_count": _row_count(Quote.flagged_by.through.objects.filter(quote_id=OuterRef("pk")), "quote_id"),
+        "vote_count": sum((F(field) for field in TALLY_FIELDS[1:]), F(TALLY_FIELDS[0])),
+        "signed_count": _row_count(Signature.objects.filter(has_image, quote=OuterRef("pk"), refused=False)),
+        "refused_count": _row_count(Signature.objects.filter(quote=OuterRef("pk"), refused=True)),
+        # participants who have neither signed nor refused (a cleared signature counts as pending)
+        "pending_count": _row_count(participants.filter(~Exists(answered)), "quote_id"),
+    }
+
+
+def rank_from_tally(tally):
+    """
+    Derive the rank from per-rarity vote counts. Ties go to the more common
+    rarity, and a quote without votes is common.
+    """
+    top = max(tally.values(), default=0)
+    for rank in RARITY_ORDER:
+        if tally.get(rank, 0) == top:
+            return rank
+    return RARITY_ORDER[0]
+
+
+def apply_rank_vote(quote, old_rarity=None, new_rarity=None):
+    """
+    Move a single vote between the tally counters of `quote` (cast:
+    old_rarity=None, removal: new_rarity=None) and re-derive its rank.
+    """
+    if old_rarity == new_rarity:
+        return quote.rank
+
+    changes = {}
+    if old_rarity:
+        changes[tally_field(old_rarity)] = F(tally_field(old_rarity)) - 1
+    if new_rarity:
+        changes[tally_field(new_rarity)] = F(tally_field(new_rarity)) + 1
+
+    with transaction.atomic():
+        rows = Quote.objects.filter(pk=quote.pk)
+        rows.update(**changes)
+        counts = rows.values(*TALLY_FIELDS).get()
+        rank = rank_from_tally({r: counts[tally_field(r)] for r in RARITY_ORDER})
+        rows.update(rank=rank)
+        mark_quotes_changed([quote.pk])
+
+    for field, value in counts.items():
+        setattr(quote, field, value)
+    quote.rank = rank
+    return rank
+
+
+def recount_rank_tallies(quote_ids):
+    """Recount the tally counters of `quote_ids` from their votes and re-derive their ranks."""
+    rows = Quote.objects.filter(pk__in=quote_ids)
+    rows.update(**{
+        tally_field(rarity): _row_count(QuoteRankVote.objects.filter(quote=OuterRef("pk"), rarity=rarity))
+        for rarity in RARITY_ORDER
+    })
+    moved = defaultdict(list)
+    for pk, rank, *counts in rows.values_list("pk", "rank", *TALLY_FIELDS):
+        new_rank = rank_from_tally(dict(zip(RARITY_ORDER, counts)))
+        if new_rank != rank:
+            moved[new_rank].append(pk)
+    # one UPDATE per rank, not per quote
+    for rank, pks in moved.items():
+        Quote.objects.filter(pk__in=pks).update(rank=rank)
+
 
 def update_quote_rank(quote):
-    votes = quote.rank_votes.all()
-    tally = Counter(v.rarity for v in votes)
+    """Rebuild the tally counters of `quote` from its votes and re-derive the rank."""
+    counts = dict(
+        quote.rank_votes.values_list("rarity").annotate(n=Count("id")).order_by()
+    )
+    for rarity in RARITY_ORDER:
+        setattr(quote, tally_field(rarity), counts.get(rarity, 0))
+    quote.rank = rank_from_tally(counts)
+    quote.save(update_fields=['rank', *TALLY_FIELDS])
+
+def normalize_name(name: str) -> str:
+    # trim + collapse multiple spaces
+    return " ".join((name or "").strip().split())
+
+
+class UserNameKey(models.Model):
+    """
+    Lower-cased, whitespace-normalized username and full name of a user,
+    indexed so guest names can be checked against real users in one query.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="name_key")
+    username_key = models.CharField(max_length=150, db_index=True)
+    full_name_key = models.CharField(max_length=301, db_index=True, blank=True)
+
+    @staticmethod
+    def keys_for(user):
+        return {
+            "username_key": normalize_name(user.username).lower(),
+            "full_name_key": normalize_name(f"{user.first_name} {user.last_name}").lower(),
+        }
+
+    def __str__(self):
+        return f"{self.username_key} / {self.full_name_key}"
+
+
+# User fields embedded in quote representations, and the ones UserNameKey derives from
+EMBEDDED_USER_FIELDS = ("username", "first_name", "last_name", "email", "is_superuser", "is_active")
+NAME_KEY_FIELDS = ("username", "first_name", "last_name")
+
+
+@receiver(pre_save, sender=User)
+def remember_changed_user_fields(sender, instance, raw=False, update_fields=None, **kwargs):
+    # a login saves only last_login; skip the lookup when no watched field is written
+    if raw or instance._state.adding:
+        return
+    watched = set(EMBEDDED_USER_FIELDS)
+    if update_fields is not None:
+        watched &= set(update_fields)
+    old = User.objects.filter(pk=instance.pk).values(*watched).first() if watched else {}
+    if old is None:
+        return
+    instance._changed_user_fields = {f for f in watched if old[f] != getattr(instance, f)}
+
+
+def user_fields_changed(instance, created, fields):
+    if created:
+        return True
+    changed = getattr(instance, "_changed_user_fields", None)
+    # unknown (e.g. saved before the pre_save hook ran): assume it changed
+    return changed is None or bool(changed & set(fields))
+
+
+@receiver(post_save, sender=User)
+def sync_user_name_key(sender, instance, created=False, raw=False, **kwargs):
+    if raw or not user_fields_changed(instance, created, NAME_KEY_FIELDS):
+        return
+    UserNameKey.objects.update_or_create(user=instance, defaults=UserNameKey.keys_for(instance))
 
-    order = ['common', 'uncommon', 'rare', 'epic', 'legendary']
-    for rank in order:
-        if tally[rank] == max(tally.values(), default=0):
-            quote.rank = rank
-            quote.save(update_fields=['rank'])
-            break
 
 class AccountRequest(models.Model):
     first_name = models.CharField(max_length=150)
@@ -57,9 +242,52 @@ class Quote(models.Model):
     flagged_by = models.ManyToManyField(User, blank=True, related_name="flagged_quotes")
     is_flagged = models.BooleanField(default=False)
     rank = models.CharField(max_length=10, choices=RARITY_CHOICES, default='common')
+    # Vote tallies per rarity, kept in step by apply_rank_vote()
+    common_votes = models.PositiveIntegerField(default=0)
+    uncommon_votes = models.PositiveIntegerField(default=0)
+    rare_votes = models.PositiveIntegerField(default=0)
+    epic_votes = models.PositiveIntegerField(default=0)
+    legendary_votes = models.PositiveIntegerField(default=0)
+    # Bumped on any change to the quote or its lines, signatures, votes and flags
+    version = models.PositiveIntegerField(default=1)
+    updated_at = models.DateTimeField(default=timezone.now)
+    # Recounted from rows alongside every version bump, see counter_expressions()
+    flag_count = models.PositiveIntegerField(default=0)
+    vote_count = models.PositiveIntegerField(default=0)
+    signed_count = models.PositiveIntegerField(default=0)
+    refused_count = models.PositiveIntegerField(default=0)
+    pending_count = models.PositiveIntegerField(default=0)
     quote_notes = models.TextField(blank=True, null=True)
     quote_source = models.URLField(blank=True, null=True)
-    quote_source_image = models.ImageField(upload_to="quote_sources/", blank=True, null=True)
+    quote_source_image = models.ImageField(upload_to="quote_sources/", storage=image_storage, blank=True, null=True)
+
+    def save(self, *args, **kwargs):
+        # version, updated_at, the counters and the vote tallies / rank only change through
+        # mark_quotes_changed() and the tally helpers; a full save from a stale
+        # instance must not write old values back
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            derived = ("version", "updated_at", "rank", *COUNTER_FIELDS, *TALLY_FIELDS)
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in derived
+            ]
+        super().save(*args, **kwargs)
+
+    class Meta:
+        indexes = [
+            # Django compiles approved=True to a bare `approved` term, which SQLite only
+            # matches against a partial index condition, not a leading index column
+            models.Index(fields=['-created_at'], condition=models.Q(approved=True, visible=True),
+                         name='quotes_quote_public_idx'),
+            models.Index(fields=['approved_at'], condition=models.Q(approved=True),
+                         name='quotes_quote_approved_at_idx'),
+            models.Index(fields=['created_by', 'approved'], name='quotes_quote_author_appr_idx'),
+            # flagged quotes are a handful among thousands; index only those
+            models.Index(fields=['is_flagged'], condition=models.Q(is_flagged=True),
+                         name='quotes_quote_flagged_idx'),
+            # reference counts of shared image blobs, see release_image()
+            models.Index(fields=['quote_source_image'], name='quotes_quote_source_img_idx'),
+        ]
 
     def __str__(self):
         return f"Quote #{self.id} on {self.date} at {self.time}"
@@ -78,25 +306,203 @@ class Signature(models.Model):
     quote = models.ForeignKey(Quote, on_delete=models.CASCADE, related_name='signatures')
     user = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL)
     guest_name = models.CharField(max_length=255, blank=True)  # New field for guest
-    signature_image = models.ImageField(upload_to='signatures/', null=True, blank=True)
+    signature_image = models.ImageField(upload_to='signatures/', storage=image_storage, null=True, blank=True)
     refused = models.BooleanField(default=False)  # ✅ NEW
     signed_at = models.DateTimeField(auto_now_add=True, null=True, blank=True)
+    # Byte sizes of the image as uploaded and as stored after compress_signature()
+    image_original_bytes = models.PositiveIntegerField(null=True, blank=True)
+    image_stored_bytes = models.PositiveIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['quote', 'user'], name='quotes_sig_quote_user_idx'),
+            # duplicate-guest checks on a quote only look at guest rows
+            models.Index(fields=['quote', 'guest_name'], condition=models.Q(user__isnull=True),
+                         name='quotes_sig_quote_guest_idx'),
+            models.Index(fields=['signature_image'], name='quotes_sig_image_idx'),
+        ]
 
     def is_guest(self):
         return self.user is None and bool(self.guest_name)
     
     def admin_clear(self):
+        old_image = self.signature_image
         self.refused = False
         self.signed_at = None
-        if self.signature_image:
-            self.signature_image.delete(save=False)  # deletes file
         self.signature_image = None
-        self.save(update_fields=["refused", "signed_at", "signature_image"])
+        self.image_original_bytes = None
+        self.image_stored_bytes = None
+        with transaction.atomic():
+            self.save(update_fields=["refused", "signed_at", "signature_image",
+                                     "image_original_bytes", "image_stored_bytes"])
+            release_image(old_image)  # deletes file + renditions once unused
 
     def __str__(self):
         return f"{self.user.username} {'refused' if self.refused else 'signed'} on {self.signed_at}"
 
-@receiver(pre_delete, sender=Signature)
+@receiver(post_save, sender=Quote)
+@receiver(post_delete, sender=Quote)
+def reindex_quote(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_reindex(instance.pk)
+
+
+@receiver(post_save, sender=QuoteLine)
+@receiver(post_delete, sender=QuoteLine)
+def reindex_quote_line(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_reindex(instance.quote_id)
+
+
+@receiver(post_save, sender=Quote)
+@receiver(post_delete, sender=Quote)
+def quote_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        mark_quotes_changed([instance.pk])
+
+
+@receiver(post_save, sender=QuoteLine)
+@receiver(post_delete, sender=QuoteLine)
+@receiver(post_save, sender=Signature)
+@receiver(post_delete, sender=Signature)
+@receiver(post_save, sender=QuoteRankVote)
+def quote_part_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        mark_quotes_changed([instance.quote_id])
+
+
+# quote ids whose votes were deleted inside deferred_rank_recount(); None outside of it
+_deferred_recounts = ContextVar("deferred_rank_recounts", default=None)
+
+
+@contextmanager
+def deferred_rank_recount():
+    """
+    Recount the tallies of every quote that loses votes inside the block once,
+    at the end, instead of once per deleted vote. Wrap queryset deletes of
+    many votes (or of the quotes and users they cascade from) in it.
+    """
+    pending = set()
+    token = _deferred_recounts.set(pending)
+    try:
+        yield
+    finally:
+        _deferred_recounts.reset(token)
+    recount_rank_tallies(pending)
+    mark_quotes_changed(pending)
+
+
+@receiver(post_delete, sender=QuoteRankVote)
+def rank_vote_deleted(sender, instance, **kwargs):
+    # also covers cascades (a deleted user or quote), which never pass through apply_rank_vote;
+    # recount before mark_quotes_changed so vote_count sees the new tallies
+    pending = _deferred_recounts.get()
+    if pending is not None:
+        pending.add(instance.quote_id)
+        return
+    recount_rank_tallies([instance.quote_id])
+    mark_quotes_changed([instance.quote_id])
+
+
+@receiver(m2m_changed, sender=Quote.flagged_by.through)
+@receiver(m2m_changed, sender=Quote.participants.through)
+def quote_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        mark_quotes_changed([instance.pk])
+    elif pk_set:
+        mark_quotes_changed(pk_set)
+    else:
+        # user.flagged_quotes.clear(): the affected quotes are no longer known
+        invalidate_all_quotes()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created=False, raw=False, **kwargs):
+    # names of users are embedded in every quote they created, joined, voted on or flagged
+    # a brand-new user is in no quote yet
+    if not raw and not created and user_fields_changed(instance, created, EMBEDDED_USER_FIELDS):
+        invalidate_all_quotes()
+
+
+@receiver(pre_delete, sender=User)
+def remember_user_quotes(sender, instance, **kwargs):
+    # the cascade drops participant and flag rows and nulls lines and signatures without signals
+    instance._quote_ids = list(
+        Quote.objects.filter(
+            Q(participants=instance) | Q(flagged_by=instance)
+            | Q(lines__user=instance) | Q(signatures__user=instance)
+        ).values_list("pk", flat=True).distinct()
+    )
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    # the deleted user's name is embedded in quotes; recount and re-version the ones they touched
+    invalidate_all_quotes()
+    mark_quotes_changed(getattr(instance, "_quote_ids", ()))
+
+
+@receiver(post_save, sender=AccountRequest)
+@receiver(post_delete, sender=AccountRequest)
+def account_request_saved(sender, instance, raw=False, **kwargs):
+    # only the admins' unapproved-user badge depends on these
+    if not raw:
+        notify_quotes_changed()
+
+
+@receiver(pre_save, sender=Signature)
+def compress_signature_image(sender, instance, raw=False, **kwargs):
+    # Only freshly assigned files; an image already in storage was processed on ingest
+    image = instance.signature_image
+    if raw or not image or image._committed:
+        return
+
+    result = compress_signature(image)
+    if result is None:
+        return
+    instance.signature_image, instance.image_original_bytes, instance.image_stored_bytes = result
+
+
+IMAGE_FIELDS = [
+    # (model, field) pairs stored through image_storage, whose blobs may be shared
+    (Signature, "signature_image"),
+    (Quote, "quote_source_image"),
+]
+
+
+def image_references(name):
+    """Rows pointing at the stored file `name`."""
+    return sum(model.objects.filter(**{field: name}).count() for model, field in IMAGE_FIELDS)
+
+
+def release_image(image):
+    """
+    Drop a reference to a content-addressed image, after the row that held it
+    was deleted or saved with another file. The file and its renditions go once
+    no row points at them, and only after the transaction commits, so a
+    rollback never leaves a row without its file.
+    """
+    if not image or image_references(image.name):
+        return
+    storage, name = image.storage, image.name
+
+    def unlink():
+        # checked again at commit: another row may have picked up the same blob meanwhile
+        if not image_references(name):
+            delete_renditions(name)
+            storage.delete(name)
+
+    transaction.on_commit(unlink)
+
+
+# after the delete, so a queryset delete of every row sharing a file still unlinks it once
+@receiver(post_delete, sender=Signature)
 def delete_signature_file(sender, instance, **kwargs):
-    if instance.signature_image:
-        instance.signature_image.delete(save=False)
+    release_image(instance.signature_image)
+
+
+@receiver(post_delete, sender=Quote)
+def delete_quote_source_file(sender, instance, **kwargs):
+    release_image(instance.quote_source_image)
@@ -0,0 +1,22 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class QuoteCursorPagination(CursorPagination):
+    """
+    Keyset pagination over quotes, newest first. The cursor encodes the
+    (created_at, id) position of the last row, so `next` stays stable while
+    new quotes are being added to the book.
+    """
+    ordering = ("-created_at", "-id")
+    page_size = getattr(settings, "QUOTE_PAGE_SIZE", 25)
+    page_size_query_param = "page_size"
+    max_page_size = getattr(settings, "QUOTE_MAX_PAGE_SIZE", 100)
+
+
+def paginated_quote_response(request, queryset, serializer_class, context=None):
+    paginator = QuoteCursorPagination()
+    page = paginator.paginate_queryset(queryset, request)
+    context = context or {'request': request}
+    data = serializer_class(page, many=True, context=context).data
+    return paginator.get_paginated_response(data)
@@ -0,0 +1,170 @@
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .stats import percentile
+
+# Opt-in request profiling (QUOTEBOOK_PERF=1): PerfMiddleware times every
+# request and keeps the last PERF_SAMPLES measurements per endpoint in memory,
+# per process. The report is served at /api/debug/perf/.
+
+logger = logging.getLogger(__name__)
+
+METRICS = ("wall_ms", "queries", "db_ms", "serializer_ms", "bytes")
+
+_current = ContextVar("perf_request", default=None)
+_samples = defaultdict(lambda: {
+    metric: deque(maxlen=getattr(settings, "PERF_SAMPLES", 500)) for metric in METRICS
+})
+_lock = threading.Lock()
+
+
+def enabled():
+    return getattr(settings, "QUOTEBOOK_PERF", False)
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.serializer_depth = 0
+        self.endpoint = None
+
+
+def record_query(execute, sql, params, many, context):
+    """execute_wrapper installed on every connection: counts and times queries, logs slow ones."""
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - start
+        stats = _current.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+        if elapsed * 1000 >= getattr(settings, "PERF_SLOW_QUERY_MS", 100):
+            logger.warning("Slow query (%.1f ms)%s: %s", elapsed * 1000,
+                           f" in {stats.endpoint}" if stats and stats.endpoint else "", sql)
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    if enabled() and record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def serializer_timer():
+    """Attribute the enclosed time to serialization; nested serializers are counted once."""
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    stats.serializer_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.serializer_depth -= 1
+        if not stats.serializer_depth:
+            stats.serializer_seconds += time.perf_counter() - start
+
+
+def endpoint_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return f"{request.method} <unresolved>"
+    return f"{request.method} {match.url_name or match.route}"
+
+
+def _record(request, response, stats, start):
+    wall = time.perf_counter() - start
+    endpoint = endpoint_name(request)
+    # a streamed body (SSE, files) is never held in memory, so its size is unknown
+    size = None if response.streaming else len(response.content)
+    sample = {
+        "wall_ms": wall * 1000,
+        "queries": stats.queries,
+        "db_ms": stats.db_seconds * 1000,
+        "serializer_ms": stats.serializer_seconds * 1000,
+        "bytes": size,
+    }
+    with _lock:
+        series = _samples[endpoint]
+        for metric, value in sample.items():
+            if value is not None:
+                series[metric].append(value)
+
+
+def report():
+    """{endpoint: {"count": n, metric: {"p50", "p95", "p99", "max"}}} over the retained samples."""
+    with _lock:
+        snapshot = {endpoint: {metric: list(values) for metric, values in series.items()}
+                    for endpoint, series in _samples.items()}
+    result = {}
+    for endpoint, series in sorted(snapshot.items()):
+        result[endpoint] = {"count": len(series["wall_ms"])}
+        for metric, values in series.items():
+            result[endpoint][metric] = {
+                "p50": round(percentile(values, 50), 2),
+                "p95": round(percentile(values, 95), 2),
+                "p99": round(percentile(values, 99), 2),
+                "max": round(max(values, default=0), 2),
+            }
+    return result
+
+
+def reset():
+    with _lock:
+        _samples.clear()
+
+
+class PerfMiddleware:
+    """Records wall time, queries, DB time, serializer time and response bytes per endpoint."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        _record(request, response, stats, start)
+        return response
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        _record(request, response, stats, start)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # known once the URL resolved, so slow-query logs can name the endpoint
+        stats = _current.get()
+        if stats is not None:
+            stats.endpoint = endpoint_name(request)
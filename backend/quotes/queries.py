@@ -0,0 +1,44 @@
+from django.db.models import Exists, OuterRef, Q
+
+from .models import Quote, QuoteRankVote, Signature
+
+# Per-user filters as EXISTS / IN subqueries: no join fan-out, so no
+# DISTINCT over wide quote rows and the plain quote columns stay pageable.
+
+
+def participates(user):
+    return Quote.participants.through.objects.filter(quote_id=OuterRef("pk"), user_id=user.pk)
+
+
+def has_voted(user):
+    return QuoteRankVote.objects.filter(quote=OuterRef("pk"), user=user)
+
+
+def has_responded(user):
+    return Signature.objects.filter(quote=OuterRef("pk"), user=user)
+
+
+def participating_ids(user):
+    # an uncorrelated IN list: driven from the user's few rows instead of probing every quote
+    return Quote.participants.through.objects.filter(user_id=user.pk).values("quote_id")
+
+
+def visible_quotes(user):
+    """Approved quotes `user` may browse."""
+    approved = Quote.objects.filter(approved=True)
+    if user.is_superuser:
+        return approved
+    return approved.filter(Q(visible=True) | Q(pk__in=participating_ids(user)))
+
+
+def unrated_quotes(user):
+    """Approved public quotes `user` has not voted on yet."""
+    return Quote.objects.filter(approved=True, visible=True).filter(~Exists(has_voted(user)))
+
+
+def pending_signature_quotes(user):
+    """Approved quotes `user` takes part in and has neither signed nor refused."""
+    # pending_count > 0 is a cheap superset: it also counts participants whose signature was cleared
+    return Quote.objects.filter(approved=True, pending_count__gt=0, pk__in=participating_ids(user)).filter(
+        ~Exists(has_responded(user))
+    )
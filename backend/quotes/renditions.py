@@ -0,0 +1,84 @@
+import io
+import os
+import posixpath
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from PIL import Image, UnidentifiedImageError
+
+
+# bucket → longest edge in px
+RENDITION_SIZES = {
+    "sm": 240,
+    "md": 720,
+}
+
+# Only images uploaded through these fields may be resized
+RENDITION_DIRS = ("signatures/", "quote_sources/")
+
+
+def rendition_name(name, bucket):
+    """signatures/sign_1_2.png → signatures/sign_1_2.sm.png (stored next to the original)"""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{bucket}{ext}"
+
+
+def is_rendition(name):
+    stem = os.path.splitext(name)[0]
+    return os.path.splitext(stem)[1].lstrip(".") in RENDITION_SIZES
+
+
+def is_renderable(name):
+    clean = posixpath.normpath(name)
+    return clean == name and clean.startswith(RENDITION_DIRS) and not is_rendition(clean)
+
+
+def ensure_rendition(name, bucket):
+    """
+    Storage name of the `bucket` rendition of `name`, generating it on first
+    use. Returns None if the original is missing or not an image.
+    """
+    target = rendition_name(name, bucket)
+    if default_storage.exists(target):
+        return target
+    if not default_storage.exists(name):
+        return None
+
+    with default_storage.open(name, "rb") as original:
+        try:
+            img = Image.open(original)
+            img.load()
+        except (UnidentifiedImageError, OSError):
+            return None
+
+    fmt = img.format or "PNG"
+    limit = RENDITION_SIZES[bucket]
+    img.thumbnail((limit, limit))
+    if fmt == "JPEG" and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+
+    out = io.BytesIO()
+    img.save(out, format=fmt, optimize=True)
+    # save() may pick another name if one raced us; serve whatever it wrote
+    return default_storage.save(target, ContentFile(out.getvalue()))
+
+
+def delete_renditions(name):
+    if not name:
+        return
+    for bucket in RENDITION_SIZES:
+        target = rendition_name(name, bucket)
+        if default_storage.exists(target):
+            default_storage.delete(target)
+
+
+def rendition_urls(fieldfile, request=None):
+    """{bucket: url} for an image field; the renditions are built when first fetched."""
+    if not fieldfile:
+        return None
+    urls = {}
+    for bucket in RENDITION_SIZES:
+        url = reverse("image-rendition", args=[bucket, fieldfile.name])
+        urls[bucket] = request.build_absolute_uri(url) if request else url
+    return urls
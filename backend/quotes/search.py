@@ -0,0 +1,129 @@
+import html
+import re
+import threading
+
+from django.db import connection, transaction
+
+
+FTS_TABLE = "quotes_quote_fts"
+
+# Private-use markers around hits; swapped for <mark> after escaping the snippet
+_HIT_OPEN, _HIT_CLOSE = "\x02", "\x03"
+
+_state = threading.local()
+
+
+def fts_available():
+    return connection.vendor == "sqlite"
+
+
+def create_index(schema_editor):
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+        "USING fts5(speakers, body, notes, tokenize='unicode61 remove_diacritics 2')"
+    )
+
+
+def drop_index(schema_editor):
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def index_rows(quote_ids):
+    """(rowid, speakers, body, notes) for the searchable quotes among `quote_ids`."""
+    from .models import Quote, QuoteLine
+
+    rows = {}
+    quotes = Quote.objects.filter(pk__in=quote_ids, redacted=False).values_list("pk", "quote_notes")
+    for pk, notes in quotes:
+        rows[pk] = ([], [], notes or "")
+    lines = (
+        QuoteLine.objects
+        .filter(quote_id__in=rows)
+        .order_by("quote_id", "id")
+        .values_list("quote_id", "speaker_name", "text")
+    )
+    for quote_id, speaker, text in lines:
+        rows[quote_id][0].append(speaker)
+        rows[quote_id][1].append(text)
+    return [(pk, "\n".join(s), "\n".join(b), n) for pk, (s, b, n) in rows.items()]
+
+
+def reindex_quotes(quote_ids):
+    """
+    Refresh the index entries of `quote_ids`. Redacted or deleted quotes are
+    simply removed, so their text can never match.
+    """
+    quote_ids = list(quote_ids)
+    if not quote_ids or not fts_available():
+        return
+    placeholders = ", ".join(["%s"] * len(quote_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", quote_ids)
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, speakers, body, notes) VALUES (%s, %s, %s, %s)",
+            index_rows(quote_ids),
+        )
+
+
+def schedule_reindex(quote_id):
+    """
+    Reindex `quote_id` now, or once at commit when inside a transaction so a
+    quote whose lines are rewritten one by one is only indexed once.
+    """
+    if not connection.in_atomic_block:
+        reindex_quotes([quote_id])
+        return
+    if not hasattr(_state, "pending"):
+        _state.pending = set()
+    _state.pending.add(quote_id)
+    # every callback drains the whole set, so all but the first are no-ops
+    transaction.on_commit(_flush_pending)
+
+
+def _flush_pending():
+    ids = getattr(_state, "pending", set())
+    _state.pending = set()
+    reindex_quotes(ids)
+
+
+def to_match_expression(text):
+    """Free text → FTS5 query: every word must match, as a prefix, quoted so no syntax leaks through."""
+    words = re.findall(r"\w+", text or "")
+    return " ".join(f'"{w}"*' for w in words)
+
+
+def _render_snippet(raw):
+    escaped = html.escape(raw)
+    return escaped.replace(_HIT_OPEN, "<mark>").replace(_HIT_CLOSE, "</mark>")
+
+
+def search_quotes(text, visible, limit, offset):
+    """
+    Ranked hits for `text` among the `visible` quote queryset, as
+    (quote_id, snippet) pairs, best first. Fetches one extra row so the
+    caller can tell whether another page exists.
+    """
+    match = to_match_expression(text)
+    if not match:
+        return []
+
+    if not fts_available():
+        # Other databases: plain substring match, newest first, no snippets
+        from django.db.models import Q
+        hits = visible.filter(
+            Q(lines__text__icontains=text) | Q(lines__speaker_name__icontains=text) | Q(quote_notes__icontains=text),
+            redacted=False,
+        ).distinct().order_by("-created_at", "-id").values_list("pk", flat=True)
+        return [(pk, None) for pk in hits[offset:offset + limit + 1]]
+
+    visible_sql, visible_params = visible.values("pk").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, snippet({FTS_TABLE}, -1, %s, %s, '…', 16) "
+            f"FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid IN ({visible_sql}) "
+            f"ORDER BY bm25({FTS_TABLE}, 2.0, 4.0, 1.0) "
+            f"LIMIT %s OFFSET %s",
+            [_HIT_OPEN, _HIT_CLOSE, match, *visible_params, limit + 1, offset],
+        )
+        return [(pk, _render_snippet(snippet)) for pk, snippet in cursor.fetchall()]
@@ -1,10 +1,15 @@
 from rest_framework import serializers
 from .models import Quote, QuoteLine, Signature, AccountRequest
 from django.contrib.auth.models import User
+from django.db.models import Prefetch
 from allauth.account import app_settings as allauth_settings
 import logging
 from rest_framework import serializers
-from .models import QuoteRankVote, RARITY_CHOICES
+from .models import QuoteRankVote, RARITY_CHOICES, COUNTER_FIELDS, mark_quotes_changed, release_image
+from .search import schedule_reindex
+from django.db import transaction
+from .renditions import rendition_urls
+from .perf import serializer_timer
 from collections import defaultdict
 import json
 
@@ -46,6 +51,8 @@ class QuoteLineSerializer(serializers.ModelSerializer):
     
     def get_text(self, obj):
         raw = self.context.get("raw", False)
+        # Lines prefetched through Quote.lines already carry their parent quote,
+        # so this does not go back to the database per line.
         if obj.quote.redacted and not raw:
             return "REDACTED"
         return obj.text
@@ -89,7 +96,44 @@ class AccountRequestSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'submitted_at', 'approved', 'processed']
 
 
-class QuoteSerializer(serializers.ModelSerializer):
+class RankVoteFieldsMixin:
+    """Vote fields shared by the full quote and the compact vote response."""
+
+    def _request_user(self):
+        request = self.context.get("request")
+        return getattr(request, "user", None)
+
+    def get_rank_votes(self, obj):
+        votes_by_rarity = defaultdict(list)
+        for vote in obj.rank_votes.all():
+            votes_by_rarity[vote.rarity].append({
+                "id": vote.user.id,
+                "name": vote.user.get_full_name() or vote.user.username
+            })
+        return votes_by_rarity
+
+    def get_user_rarity_vote(self, obj):
+        user = self._request_user()
+        if not user or not user.is_authenticated:
+            return None
+        for vote in obj.rank_votes.all():
+            if vote.user_id == user.id:
+                return vote.rarity
+        return None
+
+
+class QuoteRankSerializer(RankVoteFieldsMixin, serializers.ModelSerializer):
+    """Only the fields a rank vote can change."""
+    rank_votes = serializers.SerializerMethodField()
+    user_rarity_vote = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Quote
+        fields = ['id', 'rank', 'rank_votes', 'user_rarity_vote']
+        read_only_fields = fields
+
+
+class QuoteSerializer(RankVoteFieldsMixin, serializers.ModelSerializer):
     lines = QuoteLineSerializer(many=True, required=False)
     signatures = SignatureSerializer(many=True, read_only=True)
     participants_detail = UserSerializer(source='participants', many=True, read_only=True)
@@ -97,7 +141,7 @@ class QuoteSerializer(serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
     is_flagged = serializers.BooleanField(read_only=True)
     has_flagged = serializers.SerializerMethodField()
-    flag_count = serializers.SerializerMethodField()
+    flag_count = serializers.IntegerField(read_only=True)
     flagged_by_users = serializers.SerializerMethodField()
     rank_votes = serializers.SerializerMethodField()
     user_rarity_vote = serializers.SerializerMethodField()
@@ -105,6 +149,7 @@ class QuoteSerializer(serializers.ModelSerializer):
     quote_source = serializers.URLField(required=False, allow_blank=True)
     quote_source_image = serializers.ImageField(required=False, allow_null=True)
     guest_signatures   = serializers.SerializerMethodField()
+    quote_source_image_renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = Quote
@@ -112,9 +157,12 @@ class QuoteSerializer(serializers.ModelSerializer):
             'id', 'created_by', 'participants', 'participants_detail', 'created_at',
             'date', 'time', 'visible', 'redacted', 'approved', 'approved_at',
             'lines', 'signatures', 'participant_status', 'guest_signatures', 'is_flagged', 'has_flagged', "flag_count",
-            "flagged_by_users", 'rank', 'rank_votes', 'user_rarity_vote', 'quote_notes', 'quote_source', 'quote_source_image'
+            'vote_count', 'signed_count', 'refused_count', 'pending_count',
+            "flagged_by_users", 'rank', 'rank_votes', 'user_rarity_vote', 'quote_notes', 'quote_source', 'quote_source_image',
+            'quote_source_image_renditions',
         ]
-        read_only_fields = ['created_by', 'signatures', 'created_at']
+        read_only_fields = ['created_by', 'signatures', 'created_at', 'rank',
+                            'vote_count', 'signed_count', 'refused_count', 'pending_count']
 
     def to_internal_value(self, data):
         import json
@@ -156,22 +204,20 @@ class QuoteSerializer(serializers.ModelSerializer):
 
 
 
-    def get_rank_votes(self, obj):
-        votes_by_rarity = defaultdict(list)
-        for vote in obj.rank_votes.select_related("user").all():
-            votes_by_rarity[vote.rarity].append({
-                "id": vote.user.id,
-                "name": vote.user.get_full_name() or vote.user.username
-            })
-        return votes_by_rarity
-
-    def get_user_rarity_vote(self, obj):
-        user = self.context['request'].user
-        vote = obj.rank_votes.filter(user=user).first()
-        return vote.rarity if vote else None
-
-    def get_flag_count(self, obj):
-        return obj.flagged_by.count()
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Prefetch plan for rendering many quotes. Every per-quote field below
+        reads from these in-memory collections, so a page of quotes costs a
+        fixed number of queries regardless of its size.
+        """
+        return queryset.select_related("created_by").prefetch_related(
+            "participants",
+            "flagged_by",
+            Prefetch("lines", queryset=QuoteLine.objects.order_by("id")),
+            Prefetch("signatures", queryset=Signature.objects.select_related("user")),
+            Prefetch("rank_votes", queryset=QuoteRankVote.objects.select_related("user")),
+        )
 
     def get_flagged_by_users(self, obj):
         request = self.context.get("request")
@@ -180,36 +226,84 @@ class QuoteSerializer(serializers.ModelSerializer):
         return None
         
     def get_has_flagged(self, obj):
-        user = self.context.get('request').user
-        return user.is_authenticated and obj.flagged_by.filter(id=user.id).exists()
+        user = self._request_user()
+        if not user or not user.is_authenticated:
+            return False
+        return any(u.id == user.id for u in obj.flagged_by.all())
     
 
     def get_participant_status(self, obj):
+        sigs_by_user = {}
+        for sig in obj.signatures.all():
+            if sig.user_id is not None:
+                sigs_by_user.setdefault(sig.user_id, sig)
+
+        request = self.context.get("request")
         result = []
         for user in obj.participants.all():
-            sig = obj.signatures.filter(user=user).first()
+            sig = sigs_by_user.get(user.id)
             result.append({
                 "user": user.id,
                 "name": user.get_full_name() or user.username,
                 "signature_image": sig.signature_image.url if sig and sig.signature_image else None,
+                "signature_image_renditions": rendition_urls(sig.signature_image, request) if sig else None,
                 "refused": sig.refused if sig else False,
                 "signed_at": sig.signed_at if sig else None,
                 "signature_id": sig.id if sig else None,
             })
         return result
     
+    def get_quote_source_image_renditions(self, obj):
+        return rendition_urls(obj.quote_source_image, self.context.get("request"))
+
     def get_guest_signatures(self, quote):
         return [
             {
                 "id": sig.id,
                 "name": sig.guest_name,
                 "signature_image": sig.signature_image.url if sig.signature_image else None,
+                "signature_image_renditions": rendition_urls(sig.signature_image, self.context.get("request")),
                 "refused": sig.refused,
             }
-            for sig in quote.signatures.filter(user__isnull=True)
+            for sig in quote.signatures.all()
+            if sig.user_id is None
         ]
 
 
+    def _parse_lines_and_participants(self, request):
+        # None for a key the request leaves out, so an update keeps what is there
+        try:
+            lines_data = json.loads(request.data['lines']) if 'lines' in request.data else None
+            participant_ids = (json.loads(request.data['participants'])
+                               if 'participants' in request.data else None)
+        except json.JSONDecodeError:
+            raise serializers.ValidationError("Invalid JSON for lines or participants.")
+        return lines_data, participant_ids
+
+    def _build_lines(self, quote, lines_data):
+        """Unsaved QuoteLine objects for `lines_data`, with every referenced user fetched in one query."""
+        lines_data = [dict(line) for line in lines_data]
+        try:
+            # clients may send ids as strings ("3"); key everything by int
+            for line in lines_data:
+                if line.get('user_id') in (None, ""):
+                    line['user_id'] = None
+                else:
+                    line['user_id'] = int(line['user_id'])
+        except (TypeError, ValueError):
+            raise serializers.ValidationError({"lines": "user_id must be an integer."})
+        user_ids = {line['user_id'] for line in lines_data} - {None}
+        users = User.objects.in_bulk(user_ids)
+        unknown = user_ids - set(users)
+        if unknown:
+            raise serializers.ValidationError({"lines": f"Unknown user id(s): {sorted(unknown)}"})
+
+        lines = []
+        for line_data in lines_data:
+            user_id = line_data.pop('user_id', None)
+            lines.append(QuoteLine(quote=quote, user=users.get(user_id), **line_data))
+        return lines
+
     def create(self, validated_data):
         request = self.context['request']
         
@@ -218,20 +312,19 @@ class QuoteSerializer(serializers.ModelSerializer):
         validated_data.pop('lines', None)
         validated_data.pop('created_by', None)
 
-        try:
-            lines_data = json.loads(request.data.get('lines', '[]'))
-            participant_ids = json.loads(request.data.get('participants', '[]'))
-        except json.JSONDecodeError:
-            raise serializers.ValidationError("Invalid JSON for lines or participants.")
+        lines_data, participant_ids = self._parse_lines_and_participants(request)
 
-        quote = Quote.objects.create(created_by=request.user, **validated_data)
-        quote.participants.set(participant_ids)
+        with transaction.atomic():
+            quote = Quote.objects.create(created_by=request.user, **validated_data)
+            quote.participants.set(participant_ids or [])
+            QuoteLine.objects.bulk_create(self._build_lines(quote, lines_data or []))
 
-        for line_data in lines_data:
-            user_id = line_data.pop('user_id', None)
-            user = User.objects.get(id=user_id) if user_id else None
-            QuoteLine.objects.create(quote=quote, user=user, **line_data)
+            # bulk_create skips the signals that index and version the quote
+            schedule_reindex(quote.pk)
+            mark_quotes_changed([quote.pk])
 
+        # the counters were recounted in the database, not on this instance
+        quote.refresh_from_db(fields=COUNTER_FIELDS)
         return quote
 
     def update(self, instance, validated_data):
@@ -243,16 +336,13 @@ class QuoteSerializer(serializers.ModelSerializer):
         # Replace or clear quote_source_image
         new_image = request.FILES.get('quote_source_image')
         clear_image = request.data.get('quote_source_image') == ""
+        # the old file is released after the save below, once the row no longer points at it
+        old_image = instance.quote_source_image
         if new_image:
-            # Delete old image if it exists
-            if instance.quote_source_image:
-                instance.quote_source_image.delete(save=False)
             instance.quote_source_image = new_image
 
         if clear_image:
             # Clear the image field
-            if instance.quote_source_image:
-                instance.quote_source_image.delete(save=False)
             instance.quote_source_image = None
             
 
@@ -260,34 +350,70 @@ class QuoteSerializer(serializers.ModelSerializer):
         validated_data.pop('participants', None)
         validated_data.pop('lines', None)
 
-        try:
-            lines_data = json.loads(request.data.get('lines', '[]'))
-            participant_ids = json.loads(request.data.get('participants', '[]'))
-        except json.JSONDecodeError:
-            raise serializers.ValidationError("Invalid JSON for lines or participants.")
+        lines_data, participant_ids = self._parse_lines_and_participants(request)
 
-        # Clear old data
-        Signature.objects.filter(quote=instance).delete()
-        instance.lines.all().delete()
-        instance.participants.set(participant_ids)
+        with transaction.atomic():
+            # Update quote fields
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save()
+            release_image(old_image)
 
-        # Update quote fields
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
+            if participant_ids is not None:
+                instance.participants.set(participant_ids)
 
-        for line_data in lines_data:
-            user_id = line_data.pop('user_id', None)
-            user = User.objects.get(id=user_id) if user_id else None
-            QuoteLine.objects.create(quote=instance, user=user, **line_data)
+            content_changed = False
+            if lines_data is not None:
+                content_changed = self._sync_lines(instance, self._build_lines(instance, lines_data))
 
+            # ✍️ signatures vouch for what was said: keep them unless the words changed,
+            # but drop those of users who are no longer participants
+            signatures = Signature.objects.filter(quote=instance)
+            if not content_changed:
+                signatures = signatures.filter(user__isnull=False).exclude(
+                    user__in=instance.participants.all()
+                )
+            signatures.delete()
+
+            # bulk writes skip the signals that index and version the quote
+            schedule_reindex(instance.pk)
+            mark_quotes_changed([instance.pk])
+
+        instance.refresh_from_db(fields=COUNTER_FIELDS)
         return instance
 
+    def _sync_lines(self, quote, incoming):
+        """
+        Diff `incoming` against the stored lines by position and write only
+        what differs. Returns True if the spoken content (speakers or text) changed.
+        """
+        existing = list(quote.lines.order_by('id'))
+        changed, content_changed = [], len(existing) != len(incoming)
+
+        for old, new in zip(existing, incoming):
+            if (old.speaker_name, old.text) != (new.speaker_name, new.text):
+                content_changed = True
+            elif old.user_id == new.user_id:
+                continue
+            old.speaker_name, old.text, old.user_id = new.speaker_name, new.text, new.user_id
+            changed.append(old)
+
+        if changed:
+            QuoteLine.objects.bulk_update(changed, ['speaker_name', 'text', 'user'])
+        if len(incoming) > len(existing):
+            QuoteLine.objects.bulk_create(incoming[len(existing):])
+        elif len(existing) > len(incoming):
+            QuoteLine.objects.filter(pk__in=[line.pk for line in existing[len(incoming):]]).delete()
+
+        return content_changed
+
     def to_representation(self, instance):
-        data = super().to_representation(instance)
+        with serializer_timer():
+            data = super().to_representation(instance)
 
         # Manually ensure participants are serialized if missing
-        data["participants"] = UserSerializer(instance.participants.all(), many=True).data
+        # (participants_detail already holds exactly that, no need to render twice)
+        data["participants"] = data["participants_detail"]
 
 
         return data
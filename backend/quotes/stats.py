@@ -0,0 +1,12 @@
+import math
+
+# Kept free of Django imports: the request profiler loads this at startup.
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of `samples` (any order)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
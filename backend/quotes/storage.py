@@ -0,0 +1,33 @@
+import hashlib
+import os
+import posixpath
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores each upload as `<upload_to>/<sha256><ext>`, so identical files share
+    one blob. Nothing here tracks references: callers release blobs through
+    models.release_image(), which only unlinks one when no row points at it.
+    """
+
+    def _save(self, name, content):
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+
+        directory = posixpath.dirname(name)
+        ext = os.path.splitext(name)[1].lower()
+        target = posixpath.join(directory, f"{digest.hexdigest()}{ext}")
+        if self.exists(target):
+            return target
+        # a concurrent upload of the same bytes makes the base class pick a suffixed name
+        return super()._save(target, content)
+
+
+image_storage = ContentAddressedStorage()
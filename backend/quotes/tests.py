@@ -1,3 +1,252 @@
-from django.test import TestCase
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+from unittest import skipUnless
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+
+from scheduler.jobs import unanswered_participants
+
+from .models import Quote, QuoteLine, QuoteRankVote, Signature
+from .queries import pending_signature_quotes, unrated_quotes, visible_quotes
+
+# a plan step that reads a whole table without an index, e.g. "SCAN quotes_quote"
+FULL_SCAN = re.compile(r"\bSCAN (\w+)$")
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output is SQLite-specific")
+class HotQueryIndexTests(TestCase):
+    """The hot filter paths must be answered from indexes, never by scanning a table."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("reader", "reader@example.com", "pw")
+        cls.quote = Quote.objects.create(created_by=cls.user, approved=True, visible=True)
+
+    def assertUsesIndexes(self, queryset):
+        plan = queryset.explain()
+        scans = [line for line in plan.splitlines() if FULL_SCAN.search(line.strip())]
+        self.assertEqual(scans, [], f"table scan in plan:\n{plan}")
+
+    def test_unrated_quotes(self):
+        self.assertUsesIndexes(unrated_quotes(self.user))
+
+    def test_pending_signatures(self):
+        self.assertUsesIndexes(pending_signature_quotes(self.user))
+
+    def test_visible_quotes(self):
+        self.assertUsesIndexes(visible_quotes(self.user))
+
+    def test_flagged_quotes(self):
+        self.assertUsesIndexes(Quote.objects.filter(is_flagged=True))
+
+    def test_submitted_unapproved_quotes(self):
+        self.assertUsesIndexes(Quote.objects.filter(created_by=self.user, approved=False))
+
+    def test_stale_quote_participants(self):
+        self.assertUsesIndexes(unanswered_participants(timezone.now()))
+
+    def test_guest_duplicate_check(self):
+        self.assertUsesIndexes(
+            Signature.objects.filter(quote=self.quote, user__isnull=True, guest_name__iexact="Guest")
+        )
+
+    def test_votes_by_user(self):
+        self.assertUsesIndexes(QuoteRankVote.objects.filter(user=self.user))
+
+
+def png_bytes(color="black"):
+    buffer = io.BytesIO()
+    Image.new("RGB", (40, 20), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class QuoteEditSignatureTests(TestCase):
+    """Editing a quote only voids the signatures its change actually affects."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        cls.alice = User.objects.create_user("alice", "alice@example.com", "pw")
+        cls.bob = User.objects.create_user("bob", "bob@example.com", "pw")
+
+    def setUp(self):
+        self.quote = Quote.objects.create(created_by=self.admin, approved=True, visible=True)
+        self.quote.participants.set([self.alice, self.bob])
+        QuoteLine.objects.create(quote=self.quote, speaker_name="Alice", text="Hello", user=self.alice)
+        for user in (self.alice, self.bob):
+            Signature.objects.create(quote=self.quote, user=user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def edit(self, text, participants, user_id=None):
+        lines = [{"speaker_name": "Alice", "text": text, "user_id": user_id or self.alice.pk}]
+        response = self.client.patch(f"/api/quotes/{self.quote.pk}/", {
+            "lines": json.dumps(lines),
+            "participants": json.dumps([user.pk for user in participants]),
+        }, format="multipart")
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def test_line_edit_clears_signatures(self):
+        self.edit("Hello there", [self.alice, self.bob])
+        self.assertFalse(self.quote.signatures.exists())
+
+    def test_participant_change_keeps_other_signatures(self):
+        self.edit("Hello", [self.alice])
+        self.assertEqual(list(self.quote.signatures.values_list("user", flat=True)), [self.alice.pk])
+
+    def test_line_user_id_may_be_a_string(self):
+        self.edit("Hello", [self.alice, self.bob], user_id=str(self.alice.pk))
+        self.assertEqual(self.quote.lines.get().user, self.alice)
+        self.assertEqual(self.quote.signatures.count(), 2)
+
+
+class SharedImageTests(TransactionTestCase):
+    """
+    Identical uploads share one blob, which lives until its last row is gone.
+    No wrapping transaction here, so release_image's on_commit unlinks run as in production.
+    """
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.user = User.objects.create_user("signer", "signer@example.com", "pw")
+
+    def sign(self, color="black"):
+        quote = Quote.objects.create(created_by=self.user)
+        return Signature.objects.create(
+            quote=quote, user=self.user, signature_image=ContentFile(png_bytes(color), name="sign.png")
+        )
+
+    def test_shared_blob_survives_until_last_reference(self):
+        first, second = self.sign(), self.sign()
+        self.assertEqual(first.signature_image.name, second.signature_image.name)
+        path = first.signature_image.path
+
+        first.delete()
+        self.assertTrue(os.path.exists(path))
+
+        second.delete()
+        self.assertFalse(os.path.exists(path))
+
+    def test_resubmitted_signature_unlinks_old_file(self):
+        quote = Quote.objects.create(created_by=self.user, approved=True)
+        quote.participants.add(self.user)
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        paths = []
+        for color in ("black", "white"):
+            response = client.post("/api/signatures/upload/", {
+                "quote_id": quote.pk,
+                "sign_as_user_id": self.user.pk,
+                "signature_image": io.BytesIO(png_bytes(color)),
+            }, format="multipart")
+            self.assertEqual(response.status_code, 200, response.content)
+            paths.append(Signature.objects.get(quote=quote).signature_image.path)
+
+        self.assertNotEqual(paths[0], paths[1])
+        self.assertFalse(os.path.exists(paths[0]))
+        self.assertTrue(os.path.exists(paths[1]))
+
+    def test_admin_clear_unlinks_file(self):
+        signature = self.sign()
+        path = signature.signature_image.path
+
+        signature.admin_clear()
+        self.assertFalse(os.path.exists(path))
+
+    def test_replaced_quote_source_image_is_unlinked(self):
+        admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        quote = Quote.objects.create(
+            created_by=admin, quote_source_image=ContentFile(png_bytes(), name="source.png")
+        )
+        path = quote.quote_source_image.path
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        response = client.patch(f"/api/quotes/{quote.pk}/", {
+            "quote_source_image": SimpleUploadedFile("source.png", png_bytes("white"), "image/png"),
+        }, format="multipart")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertFalse(os.path.exists(path))
+        quote.refresh_from_db()
+        self.assertTrue(os.path.exists(quote.quote_source_image.path))
+
+
+class UserDeletionTests(TestCase):
+    """Deleting a user retires every cached representation that showed them."""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.alice = User.objects.create_user("alice", "alice@example.com", "pw")
+        self.bob = User.objects.create_user("bob", "bob@example.com", "pw")
+        self.quote = Quote.objects.create(created_by=self.admin, approved=True, visible=True)
+        self.quote.participants.set([self.alice, self.bob])
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_deleted_participant_leaves_quote(self):
+        first = self.client.get("/api/quotes/")
+        version = Quote.objects.get(pk=self.quote.pk).version
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bob.delete()
+
+        response = self.client.get("/api/quotes/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        participants = response.json()["results"][0]["participants_detail"]
+        self.assertEqual([user["id"] for user in participants], [self.alice.pk])
+        self.quote.refresh_from_db()
+        self.assertGreater(self.quote.version, version)
+        self.assertEqual(self.quote.pending_count, 1)
+
+
+class BulkModerationTests(TestCase):
+    """Bulk approve drops the votes in one pass and recounts each quote once."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        cls.voters = [User.objects.create_user(f"voter{i}", f"voter{i}@example.com", "pw") for i in range(3)]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def voted_quotes(self, n):
+        ids = []
+        for _ in range(n):
+            quote = Quote.objects.create(created_by=self.admin, visible=True)
+            for voter in self.voters:
+                QuoteRankVote.objects.create(quote=quote, user=voter, rarity="rare")
+            ids.append(quote.pk)
+        return ids
+
+    def approve(self, ids):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post("/api/quotes/bulk/", {"ids": ids, "action": "approve"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_approve_resets_votes_in_constant_queries(self):
+        few, many = self.voted_quotes(2), self.voted_quotes(8)
+        self.assertEqual(self.approve(few), self.approve(many))
+        self.assertFalse(QuoteRankVote.objects.exists())
+        self.assertEqual(
+            set(Quote.objects.values_list("rank", "rare_votes", "vote_count")), {("common", 0, 0)}
+        )
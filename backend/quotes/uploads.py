@@ -0,0 +1,108 @@
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.parsers import FileUploadParser, MultiPartParser
+
+
+SIGNATURE_MAX_BYTES = getattr(settings, "SIGNATURE_UPLOAD_MAX_BYTES", 1024 * 1024)
+
+# magic bytes → (content type, extension)
+IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", ("image/png", "png")),
+    (b"\xff\xd8\xff", ("image/jpeg", "jpg")),
+)
+
+
+class PayloadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Signature image is too large."
+    default_code = "payload_too_large"
+
+
+def reject_oversized_body(parser_context, limit):
+    # Bail out on the declared length before Django starts reading the stream
+    request = parser_context["request"]
+    try:
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        length = 0
+    # multipart framing adds a little on top of the file itself
+    if length > limit + 16 * 1024:
+        raise PayloadTooLarge()
+
+
+class SignatureSizeLimitHandler(FileUploadHandler):
+    """
+    First upload handler: stops reading once the file data passes the cap,
+    for chunked bodies that declare no Content-Length up front.
+    """
+
+    def __init__(self, request=None, limit=SIGNATURE_MAX_BYTES):
+        super().__init__(request)
+        self.limit = limit
+        self.received = 0
+        self.exceeded = False
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > self.limit:
+            self.exceeded = True
+            # connection_reset: don't drain the rest of the body either
+            raise StopUpload(connection_reset=True)
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+
+def limit_upload_size(parser_context, limit):
+    request = parser_context["request"]
+    reject_oversized_body(parser_context, limit)
+    handler = SignatureSizeLimitHandler(request, limit)
+    request.upload_handlers.insert(0, handler)
+    return handler
+
+
+class SignatureMultiPartParser(MultiPartParser):
+    """Multipart parser that refuses bodies larger than the signature cap."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        handler = limit_upload_size(parser_context, SIGNATURE_MAX_BYTES)
+        data = super().parse(stream, media_type, parser_context)
+        # Django ends the parse quietly on StopUpload, without the file
+        if handler.exceeded:
+            raise PayloadTooLarge()
+        return data
+
+
+class SignatureImageParser(FileUploadParser):
+    """Raw `image/*` request body, e.g. a Blob posted straight from the canvas."""
+    media_type = "image/*"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        limit_upload_size(parser_context, SIGNATURE_MAX_BYTES)
+        try:
+            return super().parse(stream, media_type, parser_context)
+        except StopUpload:
+            raise PayloadTooLarge()
+
+    def get_filename(self, stream, media_type, parser_context):
+        return super().get_filename(stream, media_type, parser_context) or "signature"
+
+
+def sniff_image_type(upload):
+    """
+    (content_type, extension) detected from the file's leading bytes, or
+    None if it is not an accepted image. The client's declared type is ignored.
+    """
+    upload.seek(0)
+    head = upload.read(16)
+    upload.seek(0)
+
+    for magic, detected in IMAGE_SIGNATURES:
+        if head.startswith(magic):
+            return detected
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ("image/webp", "webp")
+    return None
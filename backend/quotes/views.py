@@ -5,26 +5,50 @@ from .serializers import QuoteSerializer, QuoteLineSerializer, SignatureSerializ
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from django.http import JsonResponse
+from rest_framework.request import Request
+from django.http import JsonResponse, FileResponse, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from asgiref.sync import sync_to_async
+import asyncio
 from django.views.decorators.csrf import ensure_csrf_cookie
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.contrib.auth import logout
 from django.contrib.auth.models import User
 from .serializers import UserSerializer
-from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.decorators import api_view, permission_classes, parser_classes, action
 from django.shortcuts import get_object_or_404
 from django.http import Http404
 from django.core.files.base import ContentFile
-from django.db.models import Q
-from rest_framework.exceptions import PermissionDenied
+from django.core.files.storage import default_storage
+from django.db.models import Exists, OuterRef, Prefetch, Q, Subquery
+from django.db import transaction
+from rest_framework.exceptions import NotFound, PermissionDenied
 from django.utils import timezone 
 import base64
-from .models import AccountRequest
+import binascii
+import json
+from .models import AccountRequest, UserNameKey, normalize_name, release_image
 from .serializers import AccountRequestSerializer
 from scheduler.jobs import auto_refuse_stale_quotes
-from .serializers import QuoteRankVoteSerializer
-from .models import update_quote_rank, RARITY_CHOICES
+from .serializers import QuoteRankSerializer
+from .models import apply_rank_vote, deferred_rank_recount, mark_quotes_changed, RARITY_ORDER
+from .pagination import QuoteCursorPagination, paginated_quote_response
+from .counts import abadge_counts, badge_counts
+from .queries import pending_signature_quotes, unrated_quotes, visible_quotes
+from .renditions import RENDITION_SIZES, ensure_rendition, is_renderable
+from .search import schedule_reindex, search_quotes, to_match_expression
+from .cache import render_quotes
+from . import perf
+from .events import format_event, subscribe, unsubscribe
+from .conditional import last_modified, not_modified, quotes_etag, set_validators
+from rest_framework.utils.urls import replace_query_param
+from django.conf import settings
+from .imaging import store_shared_signature
+from rest_framework.parsers import JSONParser
+from .uploads import (
+    SIGNATURE_MAX_BYTES, PayloadTooLarge, SignatureImageParser, SignatureMultiPartParser, sniff_image_type,
+)
 
 
 
@@ -36,10 +60,6 @@ class IsSuperUser(permissions.BasePermission):
     def has_permission(self, request, view):
         return bool(request.user and request.user.is_superuser)
     
-def normalize_name(name: str) -> str:
-    # trim + collapse multiple spaces
-    return " ".join((name or "").strip().split())
-
 def guest_name_conflicts_with_user(guest_name: str) -> bool:
     """
     True if guest_name matches any real user's username OR full name (case-insensitive).
@@ -50,23 +70,16 @@ def guest_name_conflicts_with_user(guest_name: str) -> bool:
 
     gn_lower = gn.lower()
 
-    # username match
-    if User.objects.filter(username__iexact=gn).exists():
-        return True
-
-    # full name match (first + last)
-    for u in User.objects.all().only("first_name", "last_name", "username"):
-        full = normalize_name(f"{u.first_name} {u.last_name}")  # may be ""
-        if full and full.lower() == gn_lower:
-            return True
-
-    return False
+    # single indexed lookup over the normalized username / full name keys
+    return UserNameKey.objects.filter(
+        Q(username_key=gn_lower) | Q(full_name_key=gn_lower)
+    ).exists()
     
 @api_view(['GET'])
 @permission_classes([IsSuperUser])
 def get_quote_for_editing(request, pk):
     try:
-        quote = Quote.objects.get(pk=pk)
+        quote = QuoteSerializer.setup_eager_loading(Quote.objects.all()).get(pk=pk)
     except Quote.DoesNotExist:
         raise Http404("Quote not found")
 
@@ -77,14 +90,7 @@ def get_quote_for_editing(request, pk):
 @api_view(['GET'])
 @permission_classes([IsApprovedUser])
 def unrated_quotes_count(request):
-    user = request.user
-    count = (
-        Quote.objects
-        .filter(approved=True, visible=True)
-        .exclude(rank_votes__user=user)
-        .distinct()
-        .count()
-    )
+    count = unrated_quotes(request.user).count()
     return Response({"count": count})
 
 
@@ -97,30 +103,46 @@ def flagged_quotes_count(request):
 @api_view(['POST'])
 @permission_classes([IsApprovedUser])
 def vote_quote_rank(request, quote_id):
-    quote = get_object_or_404(Quote, id=quote_id)
     rarity = request.data.get("rarity")
+    # ?compact=1 → only the vote/rank fields instead of the whole quote
+    compact = request.query_params.get("compact") in ("1", "true")
 
-
-    if rarity is None:
-        # Remove the user's vote if it exists
-        QuoteRankVote.objects.filter(quote=quote, user=request.user).delete()
-        update_quote_rank(quote)
-        serializer = QuoteSerializer(quote, context={"request": request})
-        return Response(serializer.data)
-    
-    if rarity not in ['common', 'uncommon', 'rare', 'epic', 'legendary']:
+    if rarity is not None and rarity not in RARITY_ORDER:
         return Response({"error": "Invalid rarity"}, status=400)
 
-    # Remove existing vote
-    QuoteRankVote.objects.filter(user=request.user, quote=quote).delete()
+    with transaction.atomic():
+        # Lock the quote row so concurrent votes on it apply one after another
+        quote = get_object_or_404(Quote.objects.select_for_update(), id=quote_id)
+        previous = (
+            QuoteRankVote.objects
+            .filter(quote=quote, user=request.user)
+            .values_list("rarity", flat=True)
+            .first()
+        )
 
-    # Create new vote
-    QuoteRankVote.objects.create(user=request.user, quote=quote, rarity=rarity)
+        if rarity is None:
+            # Remove the user's vote if it exists; the post_delete receiver recounts the tallies
+            QuoteRankVote.objects.filter(quote=quote, user=request.user).delete()
+        else:
+            # Insert or overwrite the vote on the (quote, user) unique key
+            QuoteRankVote.objects.bulk_create(
+                [QuoteRankVote(quote=quote, user=request.user, rarity=rarity)],
+                update_conflicts=True,
+                unique_fields=["quote", "user"],
+                update_fields=["rarity", "voted_at"],
+            )
+            apply_rank_vote(quote, previous, rarity)
 
-    # Update rank
-    update_quote_rank(quote)
+    if compact:
+        quote = (
+            Quote.objects
+            .prefetch_related(Prefetch("rank_votes", queryset=QuoteRankVote.objects.select_related("user")))
+            .get(pk=quote.pk)
+        )
+        return Response(QuoteRankSerializer(quote, context={"request": request}).data)
 
     # ✅ Return full updated quote
+    quote = QuoteSerializer.setup_eager_loading(Quote.objects.all()).get(pk=quote.pk)
     serializer = QuoteSerializer(quote, context={"request": request})
     return Response(serializer.data, status=200)
 
@@ -129,16 +151,8 @@ def vote_quote_rank(request, quote_id):
 @api_view(["GET"])
 @permission_classes([IsApprovedUser])
 def list_unrated_quotes(request):
-    user = request.user
-    quotes = (
-        Quote.objects
-        .filter(approved=True, visible=True)
-        .exclude(rank_votes__user=user)
-        .distinct()
-        .order_by("-created_at")
-    )
-    data = QuoteSerializer(quotes, many=True, context={"request": request}).data
-    return Response(data)
+    quotes = QuoteSerializer.setup_eager_loading(unrated_quotes(request.user))
+    return paginated_quote_response(request, quotes, QuoteSerializer)
 
 @api_view(["GET"])
 @permission_classes([IsSuperUser])
@@ -146,10 +160,9 @@ def list_flagged_quotes(request):
     quotes = (
         Quote.objects
         .filter(is_flagged=True)
-        .order_by("-created_at")
     )
-    data = QuoteSerializer(quotes, many=True, context={"request": request}).data
-    return Response(data)
+    quotes = QuoteSerializer.setup_eager_loading(quotes)
+    return paginated_quote_response(request, quotes, QuoteSerializer)
 
 @api_view(['GET'])
 @permission_classes([IsSuperUser])
@@ -189,6 +202,15 @@ def debug_run_refuse(request):
     auto_refuse_stale_quotes(15)
     return Response({"status": "Manually triggered"}, status=200)
 
+@api_view(["GET", "DELETE"])
+@permission_classes([IsSuperUser])
+def debug_perf(request):
+    # DELETE starts a fresh measurement window
+    if request.method == "DELETE":
+        perf.reset()
+        return Response(status=204)
+    return Response({"enabled": perf.enabled(), "endpoints": perf.report()})
+
 @api_view(['GET'])  # ✅ Required for DRF to set renderer & context
 @permission_classes([IsApprovedUser])
 def test_auth(request):
@@ -204,22 +226,15 @@ def unapproved_quotes(request):
     if not request.user.is_superuser:
         return Response({'error': 'Forbidden'}, status=403)
 
-    quotes = Quote.objects.filter(approved=False)
-    serializer = QuoteSerializer(quotes, many=True, context={'request': request})
-    return Response(serializer.data)
+    quotes = QuoteSerializer.setup_eager_loading(Quote.objects.filter(approved=False))
+    return paginated_quote_response(request, quotes, QuoteSerializer)
 
 @api_view(['GET'])
 @permission_classes([IsApprovedUser])
 def pending_signatures(request):
-    quotes = Quote.objects.filter(
-        approved=True,
-        participants=request.user
-    ).exclude(
-        signatures__user=request.user
-    ).distinct()
-
-    serializer = QuoteSerializer(quotes, many=True, context={'request': request})
-    return Response(serializer.data)
+    quotes = QuoteSerializer.setup_eager_loading(pending_signature_quotes(request.user))
+
+    return paginated_quote_response(request, quotes, QuoteSerializer)
 
 @api_view(['GET'])
 @permission_classes([IsApprovedUser])
@@ -233,15 +248,8 @@ def unapproved_quotes_count(request):
 @api_view(['GET'])
 @permission_classes([IsApprovedUser])
 def pending_signatures_count(request):
-    user = request.user
-    # Get quotes user is a participant in
-    quotes = Quote.objects.filter(participants=user, approved=True)
-
-    # Remove quotes they've already signed
-    signed_quote_ids = Signature.objects.filter(user=user).values_list('quote_id', flat=True)
-    pending_quotes = quotes.exclude(id__in=signed_quote_ids)
-
-    return Response({'count': pending_quotes.count()})
+    count = pending_signature_quotes(request.user).count()
+    return Response({'count': count})
 
 @api_view(["GET"])
 @permission_classes([IsSuperUser])
@@ -249,6 +257,153 @@ def unapproved_user_count(request):
     count = AccountRequest.objects.filter(approved=False).count()
     return Response({"count": count})
 
+@api_view(["GET"])
+@permission_classes([IsApprovedUser])
+def all_counts(request):
+    # Every badge count in one round-trip; admin-only counts are omitted for regular users
+    return Response(badge_counts(request.user))
+
+
+EVENT_HEARTBEAT_SECONDS = 15
+
+
+async def quote_events(request):
+    """
+    Server-sent events: the badge counts on connect, then count deltas and
+    the ids of changed quotes the user can see, as writes are committed.
+    """
+    user = await request.auser()
+    if not (user.is_authenticated and user.is_active):
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=403)
+    if not isinstance(request, ASGIRequest):
+        # a WSGI worker would buffer the endless stream instead of sending it
+        return JsonResponse({"error": "Live events need the ASGI server (quoteapi.asgi)"}, status=501)
+
+    response = StreamingHttpResponse(_quote_event_stream(user), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def _quote_event_stream(user):
+    subscription = subscribe(user)
+    try:
+        counts = await abadge_counts(user)
+        yield "retry: 5000\n\n"
+        yield format_event("counts", counts)
+
+        while True:
+            try:
+                update = await asyncio.wait_for(subscription.queue.get(), EVENT_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+
+            # the hub computed counts and visible ids for every stream at once
+            updates = [update]
+            while not subscription.queue.empty():
+                updates.append(subscription.queue.get_nowait())
+
+            if None in updates:
+                # dropped updates: recount and have the client refetch
+                fresh = await abadge_counts(user)
+                ids = set()
+            else:
+                fresh = updates[-1][0]
+                ids = set().union(*(changed for _, changed in updates))
+
+            delta = {key: value for key, value in fresh.items() if counts.get(key) != value}
+            counts = fresh
+            if delta:
+                yield format_event("counts", delta)
+
+            if None in updates:
+                yield format_event("resync", {})
+            elif ids:
+                yield format_event("quotes", {"ids": sorted(ids)})
+    finally:
+        unsubscribe(subscription)
+
+
+# ⚡ Async read endpoints (served natively under quoteapi.asgi). Auth, access
+# checks, paging and counts use the async ORM; only serialization of quotes
+# missing from the representation cache runs in a worker thread.
+
+async def _approved_user(request):
+    user = await request.auser()
+    if user.is_authenticated and user.is_active:
+        # render_quotes and the serializer read request.user
+        request.user = user
+        return user
+    return None
+
+
+def _forbidden():
+    return JsonResponse({"detail": "Authentication credentials were not provided."}, status=403)
+
+
+def _render_quotes_sync(quotes, request):
+    return render_quotes(quotes, request, lambda ids: serialize_quotes(ids, {"request": request}))
+
+
+async def async_quote_list(request):
+    user = await _approved_user(request)
+    if user is None:
+        return _forbidden()
+
+    # same keyset cursor as the sync list, so `next` links work on either endpoint
+    paginator = QuoteCursorPagination()
+    queryset = visible_quotes(user).only("id", "created_at", "version", "updated_at")
+    try:
+        page = await sync_to_async(paginator.paginate_queryset)(queryset, Request(request))
+    except NotFound as exc:
+        return JsonResponse({"detail": str(exc.detail)}, status=404)
+
+    # ETag only: a page's newest updated_at can't tell that a quote left it
+    etag = quotes_etag(request, page, scope=request.get_full_path())
+    cached = not_modified(request, etag, None)
+    if cached:
+        return cached
+
+    results = await sync_to_async(_render_quotes_sync)(page, request)
+    return set_validators(JsonResponse({
+        "next": paginator.get_next_link(),
+        "previous": paginator.get_previous_link(),
+        "results": results,
+    }), etag, None)
+
+
+async def async_quote_detail(request, pk):
+    user = await _approved_user(request)
+    if user is None:
+        return _forbidden()
+
+    try:
+        quote = await Quote.objects.aget(pk=pk)
+    except Quote.DoesNotExist:
+        return JsonResponse({"detail": "Quote not found"}, status=404)
+
+    # 🔒 Admins, the author and participants see everything; others only approved, visible quotes
+    if not (user.is_superuser or quote.created_by_id == user.pk or (quote.approved and quote.visible)):
+        if not await quote.participants.filter(pk=user.pk).aexists():
+            return JsonResponse({"detail": "You do not have access to this quote."}, status=403)
+
+    etag = quotes_etag(request, [quote])
+    modified = last_modified([quote])
+    cached = not_modified(request, etag, modified)
+    if cached:
+        return cached
+
+    data = (await sync_to_async(_render_quotes_sync)([quote], request))[0]
+    return set_validators(JsonResponse(data), etag, modified)
+
+
+async def async_all_counts(request):
+    user = await _approved_user(request)
+    if user is None:
+        return _forbidden()
+    return JsonResponse(await abadge_counts(user))
+
 
 @api_view(['POST'])
 @permission_classes([IsApprovedUser])
@@ -309,6 +464,64 @@ def refuse_signature(request):
     return Response({'success': 'Refusal recorded'})
 
 
+def _signature_for(request, quote, user_id, guest_name):
+    """
+    Signature row that a submitted image should be stored on, for either a
+    registered signer or a guest. Returns (signature, None) or (None, error response).
+    """
+    # Determine signer: only admins may sign on behalf of someone else
+    signer = None
+    if user_id:
+        if request.user.is_superuser:
+            signer = User.objects.filter(id=user_id).first()
+            if signer is None:
+                return None, Response({'error': 'Selected user not found'}, status=404)
+        else:
+            signer = request.user
+
+        if not quote.participants.filter(pk=signer.pk).exists():
+            return None, Response({'error': 'User is not a participant for this quote'}, status=403)
+
+    # Create or get existing signature
+    if signer:
+        sig, _ = Signature.objects.get_or_create(quote=quote, user=signer)
+        sig.guest_name = ""  # Clear any previous guest name
+        return sig, None
+
+    guest_name = normalize_name(guest_name)
+    if not guest_name:
+        return None, Response({'error': 'Guest name cannot be empty'}, status=400)
+
+    # ✅ block impersonation of real users (username OR full name)
+    if guest_name_conflicts_with_user(guest_name):
+        return None, Response({'error': 'Guest name conflicts with an existing user'}, status=400)
+
+    # ✅ prevent duplicate guest (case-insensitive) on this quote
+    if Signature.objects.filter(
+        quote=quote,
+        user__isnull=True,
+        guest_name__iexact=guest_name
+    ).exists():
+        return None, Response({'error': 'Guest has already responded'}, status=400)
+
+    sig, _ = Signature.objects.get_or_create(
+        quote=quote,
+        user=None,
+        guest_name=guest_name
+    )
+    return sig, None
+
+
+def _store_signature_image(sig, image_file):
+    # Replace image; the old one is released once nothing points at it any more
+    old_image = sig.signature_image
+    sig.signature_image = image_file
+    sig.refused = False
+    with transaction.atomic():
+        sig.save()
+        release_image(old_image)
+
+
 @api_view(['POST'])
 @permission_classes([IsApprovedUser])
 def submit_signature(request):
@@ -332,43 +545,11 @@ def submit_signature(request):
         name_key = user_id or guest_name.replace(" ", "_")
         data = ContentFile(base64.b64decode(imgstr), name=f'sign_{name_key}_{quote_id}.{ext}')
 
-        # Determine signer
-        signer = User.objects.get(id=user_id) if user_id else None
+        sig, error = _signature_for(request, quote, user_id, guest_name)
+        if error:
+            return error
 
-        # Create or get existing signature
-        if signer:
-            sig, _ = Signature.objects.get_or_create(quote=quote, user=signer)
-            sig.guest_name = ""  # Clear any previous guest name
-        else:
-            guest_name = normalize_name(guest_name)
-            if not guest_name:
-                return Response({'error': 'Guest name cannot be empty'}, status=400)
-
-            # ✅ block impersonation of real users (username OR full name)
-            if guest_name_conflicts_with_user(guest_name):
-                return Response({'error': 'Guest name conflicts with an existing user'}, status=400)
-
-            # ✅ prevent duplicate guest (case-insensitive) on this quote
-            if Signature.objects.filter(
-                quote=quote,
-                user__isnull=True,
-                guest_name__iexact=guest_name
-            ).exists():
-                return Response({'error': 'Guest has already responded'}, status=400)
-
-            sig, _ = Signature.objects.get_or_create(
-                quote=quote,
-                user=None,
-                guest_name=guest_name
-            )
-
-        # Replace image
-        if sig.signature_image:
-            sig.signature_image.delete(save=False)
-
-        sig.signature_image = data
-        sig.refused = False
-        sig.save()
+        _store_signature_image(sig, data)
 
         return Response({"success": True}, status=200)
 
@@ -379,12 +560,185 @@ def submit_signature(request):
             "trace": traceback.format_exc()
         }, status=400)
 
+
+@api_view(['POST'])
+@permission_classes([IsApprovedUser])
+@parser_classes([SignatureMultiPartParser, SignatureImageParser])
+def upload_signature(request):
+    """
+    Binary variant of submit_signature: the image arrives as a multipart
+    `signature_image` part, or as a raw image/* body with the other fields
+    in the query string. Django's upload handlers spool it to disk past
+    FILE_UPLOAD_MAX_MEMORY_SIZE instead of decoding it in memory.
+    """
+    fields = request.data if 'signature_image' in request.data else request.query_params
+    quote_id = fields.get('quote_id')
+    user_id = fields.get('sign_as_user_id')  # Optional
+    guest_name = fields.get('guest_name')     # Optional
+    upload = request.data.get('signature_image') or request.data.get('file')
+
+    if not quote_id or not upload:
+        return Response({"error": "Missing quote_id or signature_image"}, status=400)
+
+    if not user_id and not guest_name:
+        return Response({"error": "Must include either user_id or guest_name"}, status=400)
+
+    if upload.size > SIGNATURE_MAX_BYTES:
+        raise PayloadTooLarge()
+
+    detected = sniff_image_type(upload)
+    if not detected:
+        return Response({"error": "Signature must be a PNG, JPEG or WebP image"},
+                        status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    quote = get_object_or_404(Quote, id=quote_id)
+
+    sig, error = _signature_for(request, quote, user_id, guest_name)
+    if error:
+        return error
+
+    name_key = user_id or normalize_name(guest_name).replace(" ", "_")
+    upload.name = f'sign_{name_key}_{quote_id}.{detected[1]}'
+    upload.content_type = detected[0]
+    _store_signature_image(sig, upload)
+
+    return Response({"success": True}, status=200)
+
+def _id_list(value):
+    # multipart bodies carry lists as JSON strings
+    if isinstance(value, str):
+        try:
+            value = json.loads(value or "[]")
+        except json.JSONDecodeError:
+            return None
+    if not isinstance(value, list) or not all(type(pk) is int for pk in value):
+        return None
+    return value
+
+
+def _bulk_signature_upload(data):
+    """The shared image as an uploaded file (multipart) or a base64 data URL (JSON), or None."""
+    image = data.get('signature_image')
+    if not isinstance(image, str):
+        return image
+    try:
+        _, imgstr = image.split(';base64,')
+        return ContentFile(base64.b64decode(imgstr), name='signature')
+    except (ValueError, binascii.Error):
+        return None
+
+
+@api_view(['POST'])
+@permission_classes([IsApprovedUser])
+@parser_classes([JSONParser, SignatureMultiPartParser])
+def bulk_signatures(request):
+    """
+    Sign or refuse many quotes at once with a single image: `quote_ids` to
+    respond to, `refuse_ids` (a subset) to refuse rather than sign. The image
+    is stored once and shared by every signature row it creates.
+    """
+    quote_ids = _id_list(request.data.get('quote_ids'))
+    refuse_ids = _id_list(request.data.get('refuse_ids', []))
+    if not quote_ids or refuse_ids is None:
+        return Response({"error": "quote_ids must be a non-empty list of quote ids"}, status=400)
+    if len(quote_ids) > BULK_MAX_IDS:
+        return Response({"error": f"At most {BULK_MAX_IDS} quotes per request"}, status=400)
+    quote_ids = list(dict.fromkeys(quote_ids))
+    refuse_ids = set(refuse_ids) & set(quote_ids)
+
+    # Admins may respond on behalf of a user, like refuse_signature
+    signer = request.user
+    sign_as_user_id = request.data.get('sign_as_user_id')
+    if sign_as_user_id and request.user.is_superuser:
+        signer = User.objects.filter(id=sign_as_user_id).first()
+        if signer is None:
+            return Response({'error': 'Selected user not found'}, status=404)
+
+    upload = None
+    if len(refuse_ids) < len(quote_ids):
+        upload = _bulk_signature_upload(request.data)
+        if not upload:
+            return Response({"error": "signature_image is required to sign"}, status=400)
+        if upload.size > SIGNATURE_MAX_BYTES:
+            raise PayloadTooLarge()
+        if not sniff_image_type(upload):
+            return Response({"error": "Signature must be a PNG, JPEG or WebP image"},
+                            status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+    answered = Signature.objects.filter(
+        Q(refused=True) | (Q(signature_image__isnull=False) & ~Q(signature_image="")),
+        quote_id=OuterRef("quote_id"), user_id=signer.pk,
+    )
+    with transaction.atomic():
+        # participation and any earlier response for every quote, in one query
+        rows = Quote.participants.through.objects.filter(user_id=signer.pk, quote_id__in=quote_ids).annotate(
+            signature_id=Subquery(
+                Signature.objects.filter(quote_id=OuterRef("quote_id"), user_id=signer.pk).values("pk")[:1]
+            ),
+            answered=Exists(answered),
+        ).values_list("quote_id", "signature_id", "answered")
+        participation = {quote_id: (signature_id, done) for quote_id, signature_id, done in rows}
+
+        results, to_sign, to_refuse = {}, [], []
+        for quote_id in quote_ids:
+            if quote_id not in participation:
+                results[quote_id] = "Not a participant of this quote"
+            elif participation[quote_id][1]:
+                results[quote_id] = "Signature already exists"
+            else:
+                (to_refuse if quote_id in refuse_ids else to_sign).append(quote_id)
+
+        sign_values, refuse_values = {}, {"refused": True}
+        if to_sign:
+            stored = store_shared_signature(upload)
+            if stored is None:
+                return Response({"error": "Signature image could not be read"}, status=400)
+            name, original_bytes, stored_bytes = stored
+            sign_values = {"refused": False, "signature_image": name,
+                           "image_original_bytes": original_bytes, "image_stored_bytes": stored_bytes}
+
+        # a cleared signature keeps its row; fill it in rather than adding a second one
+        now = timezone.now()
+        for group, values in ((to_sign, sign_values), (to_refuse, refuse_values)):
+            cleared = [participation[quote_id][0] for quote_id in group if participation[quote_id][0]]
+            if cleared:
+                Signature.objects.filter(pk__in=cleared).update(signed_at=now, **values)
+            Signature.objects.bulk_create(
+                Signature(quote_id=quote_id, user=signer, **values)
+                for quote_id in group if not participation[quote_id][0]
+            )
+
+        # bulk writes skip the signals that recount and announce quotes
+        mark_quotes_changed(to_sign + to_refuse)
+
+    return Response({"results": [
+        {"id": quote_id, "ok": True, "refused": quote_id in refuse_ids} if quote_id not in results
+        else {"id": quote_id, "ok": False, "error": results[quote_id]}
+        for quote_id in quote_ids
+    ]})
+
+@api_view(['GET'])
+@permission_classes([IsApprovedUser])
+def image_rendition(request, bucket, name):
+    """Serve a resized copy of an uploaded image, generating it on first request."""
+    if bucket not in RENDITION_SIZES or not is_renderable(name):
+        raise Http404("Unknown rendition")
+
+    target = ensure_rendition(name, bucket)
+    if not target:
+        raise Http404("Image not found")
+
+    response = FileResponse(default_storage.open(target, "rb"))
+    response["Cache-Control"] = "private, max-age=300"
+    return response
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def submitted_unapproved_quotes(request):
-    quotes = Quote.objects.filter(created_by=request.user, approved=False)
-    serializer = QuoteSerializer(quotes, many=True)
-    return Response(serializer.data)
+    quotes = QuoteSerializer.setup_eager_loading(
+        Quote.objects.filter(created_by=request.user, approved=False)
+    )
+    return paginated_quote_response(request, quotes, QuoteSerializer)
 
 
 
@@ -396,21 +750,117 @@ class LogoutView(APIView):
         logout(request)
         return Response({"detail": "Logged out successfully"}, status=status.HTTP_200_OK)
 
+BULK_ACTIONS = ("approve", "visibility", "redact", "unflag", "delete")
+BULK_MAX_IDS = 500
+
+
+def serialize_quotes(quote_ids, context):
+    quotes = list(QuoteSerializer.setup_eager_loading(Quote.objects.filter(pk__in=quote_ids)))
+    return zip(quotes, QuoteSerializer(quotes, many=True, context=context).data)
+
+
 class QuoteViewSet(viewsets.ModelViewSet):
     queryset = Quote.objects.all()
     serializer_class = QuoteSerializer
     permission_classes = [IsApprovedUser]
+    pagination_class = QuoteCursorPagination
+
 
+    def get_visible_queryset(self):
+        return visible_quotes(self.request.user)
 
     def get_queryset(self):
-        user = self.request.user
-        if user.is_superuser:
-            return Quote.objects.filter(approved=True)
-        return Quote.objects.filter(
-            approved=True
-        ).filter(
-            Q(visible=True) | Q(participants=user)
-        ).distinct()
+        return QuoteSerializer.setup_eager_loading(self.get_visible_queryset())
+
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request):
+        text = request.query_params.get("q", "")
+        if not to_match_expression(text):
+            return Response({"error": "Search query is required"}, status=400)
+
+        try:
+            limit = min(int(request.query_params.get("page_size", settings.QUOTE_PAGE_SIZE)),
+                        settings.QUOTE_MAX_PAGE_SIZE)
+            offset = int(request.query_params.get("offset", 0))
+        except ValueError:
+            return Response({"error": "page_size and offset must be integers"}, status=400)
+        limit, offset = max(limit, 1), max(offset, 0)
+
+        hits = search_quotes(text, self.get_visible_queryset(), limit, offset)
+        has_more = len(hits) > limit
+        hits = hits[:limit]
+
+        quotes = QuoteSerializer.setup_eager_loading(
+            Quote.objects.filter(pk__in=[pk for pk, _ in hits])
+        ).in_bulk()
+        ordered = [quotes[pk] for pk, _ in hits if pk in quotes]
+        snippets = dict(hits)
+        data = self.get_serializer(ordered, many=True).data
+
+        url = request.build_absolute_uri()
+        return Response({
+            "next": replace_query_param(url, "offset", offset + limit) if has_more else None,
+            "previous": replace_query_param(url, "offset", max(offset - limit, 0)) if offset else None,
+            "results": [{"snippet": snippets[q["id"]], "quote": q} for q in data],
+        })
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Moderate many quotes at once: {"ids": [...], "action": one of BULK_ACTIONS,
+        "value": bool for visibility / redact}. Applied in one transaction.
+        """
+        if not request.user.is_superuser:
+            raise PermissionDenied("Only admins can moderate quotes.")
+
+        ids = request.data.get("ids")
+        bulk_action = request.data.get("action")
+        value = request.data.get("value", True)
+        if not isinstance(ids, list) or not ids or not all(type(pk) is int for pk in ids):
+            return Response({"error": "ids must be a non-empty list of quote ids"}, status=400)
+        if len(ids) > BULK_MAX_IDS:
+            return Response({"error": f"At most {BULK_MAX_IDS} quotes per request"}, status=400)
+        if bulk_action not in BULK_ACTIONS:
+            return Response({"error": f"action must be one of {', '.join(BULK_ACTIONS)}"}, status=400)
+        if not isinstance(value, bool):
+            return Response({"error": "value must be true or false"}, status=400)
+
+        with transaction.atomic():
+            found = set(Quote.objects.filter(pk__in=ids).values_list("pk", flat=True))
+            quotes = Quote.objects.filter(pk__in=found)
+
+            if bulk_action == "delete":
+                # per-row delete signals clean up signature files, the search index and badges;
+                # the cascaded votes are recounted once, not once per vote
+                with deferred_rank_recount():
+                    quotes.delete()
+            else:
+                if bulk_action in ("approve", "unflag"):
+                    Quote.flagged_by.through.objects.filter(quote_id__in=found).delete()
+
+                if bulk_action == "approve":
+                    # same reset as a single approval: no flags, no votes, fresh rank
+                    with deferred_rank_recount():
+                        QuoteRankVote.objects.filter(quote_id__in=found).delete()
+                    quotes.update(approved=True, approved_at=timezone.now(), is_flagged=False)
+                elif bulk_action == "unflag":
+                    quotes.update(is_flagged=False)
+                elif bulk_action == "visibility":
+                    quotes.update(visible=value)
+                elif bulk_action == "redact":
+                    quotes.update(redacted=value)
+                    # redacted quotes are left out of the search index
+                    for pk in found:
+                        schedule_reindex(pk)
+
+                # update() skips the signals that version, recount and announce quotes
+                mark_quotes_changed(found)
+
+        results = [
+            {"id": pk, "ok": True} if pk in found else {"id": pk, "ok": False, "error": "Quote not found"}
+            for pk in dict.fromkeys(ids)
+        ]
+        return Response({"action": bulk_action, "results": results})
 
     def perform_create(self, serializer):
         user = self.request.user
@@ -442,9 +892,9 @@ class QuoteViewSet(viewsets.ModelViewSet):
         instance.is_flagged = False
         instance.save(update_fields=["is_flagged"])
 
-        # ▸ reset votes & rank (optional but usually desired)
-        QuoteRankVote.objects.filter(quote=instance).delete()
-        update_quote_rank(instance)
+        # ▸ reset votes & rank (optional but usually desired), recounted once
+        with deferred_rank_recount():
+            QuoteRankVote.objects.filter(quote=instance).delete()
 
         resp = super().update(request, *args, **kwargs)
 
@@ -470,8 +920,8 @@ class QuoteViewSet(viewsets.ModelViewSet):
         instance.is_flagged = False
         instance.save(update_fields=["is_flagged"])
 
-        QuoteRankVote.objects.filter(quote=instance).delete()
-        update_quote_rank(instance)
+        with deferred_rank_recount():
+            QuoteRankVote.objects.filter(quote=instance).delete()
 
         resp = super().partial_update(request, *args, **kwargs)
 
@@ -487,7 +937,23 @@ class QuoteViewSet(viewsets.ModelViewSet):
 
     def list(self, request, *args, **kwargs):
         # print("📌 Logged in user:", request.user)
-        return super().list(request, *args, **kwargs)
+        # Page over bare rows; full serialization only runs for quotes missing from the cache
+        queryset = self.filter_queryset(self.get_visible_queryset()).only(
+            "id", "created_at", "version", "updated_at"
+        )
+        page = self.paginate_queryset(queryset)
+
+        # ETag only: a page's newest updated_at can't tell that a quote was deleted or hidden
+        etag = quotes_etag(request, page, scope=request.get_full_path())
+        cached = not_modified(request, etag, None)
+        if cached:
+            return cached
+
+        data = render_quotes(page, request, self.serialize_quotes)
+        return set_validators(self.get_paginated_response(data), etag, None)
+
+    def serialize_quotes(self, quote_ids):
+        return serialize_quotes(quote_ids, self.get_serializer_context())
     
     def get_object(self):
         pk = self.kwargs["pk"]
@@ -520,7 +986,7 @@ class QuoteViewSet(viewsets.ModelViewSet):
         pk = self.kwargs["pk"]
 
         try:
-            quote = Quote.objects.get(pk=pk)
+            quote = Quote.objects.prefetch_related("participants").get(pk=pk)
         except Quote.DoesNotExist:
             raise Http404("Quote not found")
 
@@ -534,8 +1000,14 @@ class QuoteViewSet(viewsets.ModelViewSet):
             if not quote.visible and user not in quote.participants.all() and not user.is_superuser and  user == quote.created_by:
                 raise PermissionDenied("You do not have access to this quote.")
 
-        serializer = self.get_serializer(quote)
-        return Response(serializer.data)
+        etag = quotes_etag(request, [quote])
+        modified = last_modified([quote])
+        cached = not_modified(request, etag, modified)
+        if cached:
+            return cached
+
+        data = render_quotes([quote], request, self.serialize_quotes)[0]
+        return set_validators(Response(data), etag, modified)
     
     def destroy(self, request, *args, **kwargs):
         user = request.user
@@ -1,26 +1,65 @@
-from django_apscheduler.jobstores import DjangoJobStore, register_events, register_job
-from apscheduler.schedulers.background import BackgroundScheduler
-from quotes.models import Quote, Signature
-from django.utils import timezone
+import logging
 from datetime import timedelta
-from django.contrib.auth.models import User
+from time import perf_counter
 
-def auto_refuse_stale_quotes(time=(60*60*24*14)):
-    now = timezone.now()
-    threshold = now - timedelta(seconds=time)
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from quotes.models import Quote, Signature, mark_quotes_changed
+
+
+logger = logging.getLogger(__name__)
 
-    stale_quotes = Quote.objects.filter(
-        approved=True,
-        approved_at__lt=threshold
-    ).exclude(
-        signatures__isnull=False
-    ).distinct()
+BATCH_SIZE = 1000
+
+
+def unanswered_participants(approved_before):
+    """
+    (quote_id, user_id) of the participants of quotes approved before the
+    cutoff that nobody has signed or refused yet.
+    """
+    # one anti-join; a quote with any response is left alone, as before
+    Participant = Quote.participants.through
+    return (
+        Participant.objects
+        .filter(quote__approved=True, quote__approved_at__lt=approved_before)
+        .filter(~Exists(Signature.objects.filter(quote_id=OuterRef("quote_id"))))
+        .values_list("quote_id", "user_id")
+        .order_by("quote_id", "user_id")
+    )
+
+
+def auto_refuse_stale_quotes(time=(60*60*24*14)):
+    """
+    Record a refusal for every participant who has not responded to an
+    approved quote within `time` seconds of its approval.
+    """
+    started = perf_counter()
+    threshold = timezone.now() - timedelta(seconds=time)
+    missing = unanswered_participants(threshold)
 
     count = 0
-    for quote in stale_quotes:
-        for participant in quote.participants.all():
-            if not Signature.objects.filter(quote=quote, user=participant).exists():
-                Signature.objects.create(quote=quote, user=participant, refused=True)
-                count += 1
+    batches = 0
+    touched = set()
+    with transaction.atomic():
+        batch = []
+        for quote_id, user_id in missing.iterator(chunk_size=BATCH_SIZE):
+            touched.add(quote_id)
+            batch.append(Signature(quote_id=quote_id, user_id=user_id, refused=True))
+            if len(batch) >= BATCH_SIZE:
+                Signature.objects.bulk_create(batch)
+                count += len(batch)
+                batches += 1
+                batch = []
+        if batch:
+            Signature.objects.bulk_create(batch)
+            count += len(batch)
+            batches += 1
+        mark_quotes_changed(touched)
 
-    print(f"[⏰ auto_refuse_stale_quotes] Refused {count} stale signature(s)")
+    logger.info(
+        "auto_refuse_stale_quotes: refused %d stale signature(s) in %d batch(es), %.1f ms",
+        count, batches, (perf_counter() - started) * 1000,
+    )
+    return count
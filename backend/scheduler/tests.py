@@ -1,3 +1,41 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.utils import timezone
+
+from quotes.models import Quote, Signature
+
+from .jobs import auto_refuse_stale_quotes
+
+
+class AutoRefuseStaleQuotesTests(TestCase):
+    """Only quotes nobody has answered are auto-refused, whatever the cached counters say."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user("author", "author@example.com", "pw")
+        cls.alice = User.objects.create_user("alice", "alice@example.com", "pw")
+        cls.bob = User.objects.create_user("bob", "bob@example.com", "pw")
+
+    def stale_quote(self):
+        quote = Quote.objects.create(created_by=self.author, approved=True,
+                                     approved_at=timezone.now() - timedelta(days=30))
+        quote.participants.set([self.alice, self.bob])
+        return quote
+
+    def test_unanswered_quote_is_refused_for_everyone(self):
+        quote = self.stale_quote()
+        self.assertEqual(auto_refuse_stale_quotes(), 2)
+        self.assertEqual(quote.signatures.filter(refused=True).count(), 2)
+
+    def test_partly_signed_quote_is_left_alone(self):
+        quote = self.stale_quote()
+        Signature.objects.create(quote=quote, user=self.alice)
+        self.assertEqual(auto_refuse_stale_quotes(), 0)
+        self.assertFalse(quote.signatures.filter(user=self.bob).exists())
 
-# Create your tests here.
+    def test_stale_pending_count_does_not_hide_quote(self):
+        quote = self.stale_quote()
+        Quote.objects.filter(pk=quote.pk).update(pending_count=0)
+        self.assertEqual(auto_refuse_stale_quotes(), 2)
@@ -20,7 +20,6 @@ import FlaggedQuotesPage from "./pages/FlaggedQuotesPage";
 
 
 import useAppContext from "./context/useAppContext";
-import { useUnapprovedUserCount } from "./context/UnapprovedUserContext";
 
 
 import Navbar from "./components/Navbar";
@@ -28,6 +27,7 @@ import AdminRoute from "./components/AdminRoute";
 import PrivateRoute from "./components/PrivateRoute";
 
 import useRefreshAllQuoteContexts from "./utils/refreshAllQuoteContexts";
+import useQuoteEvents from "./hooks/useQuoteEvents";
 
 
 import ErrorBanner from "./components/ErrorBanner";
@@ -38,16 +38,17 @@ import "react-confirm-alert/src/react-confirm-alert.css";
 function App() {
   const { user, loading, setLoading } = useAppContext();  // ✅ use only this
   const refreshAll = useRefreshAllQuoteContexts();
-  const { refreshUnapprovedUserCount } = useUnapprovedUserCount();
 
   // 🔄 Refresh quote data once the user is known
   useEffect(() => {
     if (user) {
       refreshAll();
-      if (user.isSuperuser) refreshUnapprovedUserCount();
     }
   }, [user]);
 
+  // 📡 Keep badges live after the first fetch
+  useQuoteEvents(user);
+
 
 
 
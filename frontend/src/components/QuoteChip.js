@@ -36,9 +36,7 @@ export default function QuoteChip({
   const participantData = quote.participant_status?.find(p => p.user === user?.id);
   const needsSignature = isParticipant && !participantData?.signature_image && !participantData?.refused;
 
-  const hasUnsignedParticipant = quote.participant_status?.some(
-    p => !p.signature_image && !p.refused
-  );
+  const hasUnsignedParticipant = quote.pending_count > 0;
 
   const shouldShowSignButton = showSignButtons && (needsSignature || (user?.isSuperuser && hasUnsignedParticipant));
   const shouldShowRefuseButton = showSignButtons && needsSignature;
@@ -139,7 +137,7 @@ export default function QuoteChip({
               <span className="text-red-600 font-semibold">Refusal to sign</span>
             ) : p.signature_image ? (
               <img
-                src={`${p.signature_image}?${new Date().getTime()}`}
+                src={`${p.signature_image_renditions?.sm ?? p.signature_image}?${new Date().getTime()}`}
                 alt="signature"
                 className="h-6 max-w-[120px] object-contain"
               />
@@ -160,7 +158,7 @@ export default function QuoteChip({
               <span className="text-red-600 font-semibold">Refusal to sign</span>
             ) : g.signature_image ? (
               <img
-                src={`${g.signature_image}?${new Date().getTime()}`}
+                src={`${g.signature_image_renditions?.sm ?? g.signature_image}?${new Date().getTime()}`}
                 alt="guest signature"
                 className="h-6 max-w-[120px] object-contain"
               />
@@ -1,4 +1,4 @@
-import { useEffect, useState } from "react";
+import { useCallback, useEffect, useRef, useState } from "react";
 import api from "../api/axios";
 import QuoteChip from "./QuoteChip";
 import EmptyState from "./EmptyState";
@@ -17,18 +17,48 @@ export default function QuoteListPage({
 }) {
   const [loading, setLoading]   = useState(true);
   const [quotes,  setQuotes]    = useState([]);
+  const [nextUrl, setNextUrl]   = useState(null);   // cursor for the next page
+  const [loadingMore, setLoadingMore] = useState(false);
+  const sentinelRef = useRef(null);
   const { user, setUser, setError, setSuccess } = useAppContext();
 
   useScrollRestoration({key: scrollKey, loading});
 
   useEffect(() => {
     setLoading(true);
+    setNextUrl(null);
     api.get(fetchUrl, { withCredentials: true })
-       .then(res => { setQuotes(res.data); setError(null); })
+       .then(res => { setQuotes(res.data.results); setNextUrl(res.data.next); setError(null); })
        .catch(()  => { setError("Failed to load quotes. Please try again later."); setQuotes([]); })
        .finally(() => setLoading(false));
   }, [fetchUrl]);
 
+  // 📜 Stream further pages as the user scrolls towards the end of the list
+  const loadMore = useCallback(() => {
+    if (!nextUrl || loadingMore) return;
+    setLoadingMore(true);
+    api.get(nextUrl, { withCredentials: true })
+       .then(res => {
+         setQuotes(prev => {
+           const seen = new Set(prev.map(q => q.id));
+           return [...prev, ...res.data.results.filter(q => !seen.has(q.id))];
+         });
+         setNextUrl(res.data.next);
+       })
+       .catch(() => setError("Failed to load more quotes."))
+       .finally(() => setLoadingMore(false));
+  }, [nextUrl, loadingMore]);
+
+  useEffect(() => {
+    const node = sentinelRef.current;
+    if (!node || !nextUrl) return;
+    const observer = new IntersectionObserver(entries => {
+      if (entries[0].isIntersecting) loadMore();
+    }, { rootMargin: "600px" });
+    observer.observe(node);
+    return () => observer.disconnect();
+  }, [nextUrl, loadMore]);
+
   const handleRemove = id => {
     if (!enableLocalRemove) return;
     setQuotes(prev => prev.filter(q => q.id !== id));
@@ -52,6 +82,8 @@ export default function QuoteListPage({
           />
         ))
       )}
+
+      {nextUrl && <div ref={sentinelRef} className="h-8" />}
     </div>
   );
 }
@@ -31,7 +31,7 @@ export default function QuoteNotes({ quote, setShowImageModal }) {
             )}
             {quote.quote_source_image && (
               <img
-                src={quote.quote_source_image}
+                src={quote.quote_source_image_renditions?.md ?? quote.quote_source_image}
                 alt="Quote Source"
                 className="max-h-64 rounded border object-contain mx-auto shadow cursor-pointer hover:opacity-80 transition"
                 onClick={setShowImageModal}
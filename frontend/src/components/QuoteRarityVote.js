@@ -40,12 +40,13 @@ export default function QuoteRarityVote({ quote, setQuote }) {
     setSubmitting(true);
     const clearing = currentVote === rarity;
     try {
+      // compact → only id / rank / rank_votes / user_rarity_vote come back
       const res = await api.post(
-        `/quotes/${quote.id}/vote/`,
+        `/quotes/${quote.id}/vote/?compact=1`,
         { rarity: clearing ? null : rarity },
         { withCredentials:true, headers:{ "X-CSRFToken":getCookie("csrftoken") } }
       );
-      setQuote(res.data);
+      setQuote(prev => ({ ...prev, ...res.data }));
       refreshAll();
     } catch { setError("Failed to register vote."); }
     finally { setSubmitting(false); }
@@ -107,12 +107,21 @@ export default function SignaturePadSingle({
     if (!refuse && padRef.current.isEmpty())             { setErrMsg("Signature required."); return; }
     if (isGuest  && !guestName.trim() && !refuse)        { setErrMsg("Guest name required."); return; }
 
-    const endpoint = refuse ? "/api/signatures/refuse/" : "/api/signatures/submit/";
-    const payload  = {
-      quote_id: quote.id,
-      ...(isGuest ? { guest_name: guestName.trim() } : { sign_as_user_id: signerId }),
-      ...(refuse ? {} : { signature_image: padRef.current.toDataURL("image/png") }),
-    };
+    const signer = isGuest ? { guest_name: guestName.trim() } : { sign_as_user_id: signerId };
+    let endpoint, payload;
+
+    if (refuse) {
+      endpoint = "/api/signatures/refuse/";
+      payload  = { quote_id: quote.id, ...signer };
+    } else {
+      // 📤 send the canvas as a binary PNG instead of a base64 data URL
+      const blob = await new Promise(resolve => canvasRef.current.toBlob(resolve, "image/png"));
+      endpoint = "/api/signatures/upload/";
+      payload  = new FormData();
+      payload.append("quote_id", quote.id);
+      Object.entries(signer).forEach(([k, v]) => payload.append(k, v));
+      payload.append("signature_image", blob, "signature.png");
+    }
 
     try {
       await api.post(endpoint, payload, {
@@ -1,4 +1,4 @@
-import { createContext, useContext, useEffect, useState } from "react";
+import { createContext, useContext, useState } from "react";
 import api from "../api/axios";
 
 const FlaggedQuoteContext = createContext();
@@ -7,9 +7,9 @@ export function FlaggedQuoteProvider({ children }) {
   const [flaggedCount, setFlaggedCount] = useState(0);
 
   const refreshFlaggedCount = () => {
-    api.get("/quotes/flagged/", { withCredentials: true })
+    api.get("/quotes/flagged/count/", { withCredentials: true })
       .then(res => {
-        setFlaggedCount(res.data.length);
+        setFlaggedCount(res.data.count);
       })
       .catch((error) => {
         console.error("Failed to fetch unapproved quote count", error);
@@ -17,12 +17,8 @@ export function FlaggedQuoteProvider({ children }) {
       });
   };
 
-  useEffect(() => {
-    refreshFlaggedCount();
-  }, []);
-
   return (
-    <FlaggedQuoteContext.Provider value={{ flaggedCount, refreshFlaggedCount }}>
+    <FlaggedQuoteContext.Provider value={{ flaggedCount, setFlaggedCount, refreshFlaggedCount }}>
       {children}
     </FlaggedQuoteContext.Provider>
   );
@@ -1,5 +1,5 @@
 // src/context/SignatureContext.js
-import { createContext, useContext, useState, useEffect } from "react";
+import { createContext, useContext, useState } from "react";
 import api from "../api/axios";
 
 const SignatureContext = createContext();
@@ -22,12 +22,8 @@ export function SignatureProvider({ children }) {
     }
   };
 
-  useEffect(() => {
-    refreshCount();
-  }, []);
-
   return (
-    <SignatureContext.Provider value={{ pendingCount, refreshCount }}>
+    <SignatureContext.Provider value={{ pendingCount, setPendingCount, refreshCount }}>
       {children}
     </SignatureContext.Provider>
   );
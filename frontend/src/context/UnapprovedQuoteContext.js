@@ -21,7 +21,7 @@ export function UnapprovedQuoteProvider({ children }) {
   }, []);
 
   return (
-    <UnapprovedQuoteContext.Provider value={{ unapprovedCount, refreshUnapprovedCount }}>
+    <UnapprovedQuoteContext.Provider value={{ unapprovedCount, setUnapprovedCount, refreshUnapprovedCount }}>
       {children}
     </UnapprovedQuoteContext.Provider>
   );
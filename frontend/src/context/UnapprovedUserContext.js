@@ -1,4 +1,4 @@
-import React, { createContext, useContext, useEffect, useState } from "react";
+import React, { createContext, useContext, useState } from "react";
 import api from "../api/axios";
 
 const UnapprovedUserContext = createContext();
@@ -20,13 +20,9 @@ export function UnapprovedUserProvider({ children }) {
       .finally(() => setLoading(false));
   };
 
-  useEffect(() => {
-    refreshUnapprovedUserCount();
-  }, []);
-
   return (
     <UnapprovedUserContext.Provider
-      value={{ unapprovedUserCount, refreshUnapprovedUserCount, loading }}
+      value={{ unapprovedUserCount, setUnapprovedUserCount, refreshUnapprovedUserCount, loading, setLoading }}
     >
       {children}
     </UnapprovedUserContext.Provider>
@@ -1,4 +1,4 @@
-import { createContext, useContext, useEffect, useState } from "react";
+import { createContext, useContext, useState } from "react";
 import api from "../api/axios";
 
 const UnratedQuoteContext = createContext();
@@ -16,12 +16,8 @@ export function UnratedQuoteProvider({ children }) {
         });
     };
 
-  useEffect(() => {
-    refreshUnratedCount();
-  }, []);
-
   return (
-    <UnratedQuoteContext.Provider value={{ unratedCount, refreshUnratedCount }}>
+    <UnratedQuoteContext.Provider value={{ unratedCount, setUnratedCount, refreshUnratedCount }}>
       {children}
     </UnratedQuoteContext.Provider>
   );
@@ -0,0 +1,33 @@
+import { useEffect, useRef } from "react";
+import api from "../api/axios";
+import useRefreshAllQuoteContexts, { useApplyBadgeCounts } from "../utils/refreshAllQuoteContexts";
+
+// 📡 Live badge counts and quote changes pushed by the server (/api/events/).
+// Pages that show a quote can listen for the "quotes-changed" window event.
+export default function useQuoteEvents(user) {
+  const applyCounts = useApplyBadgeCounts();
+  const refreshAll = useRefreshAllQuoteContexts();
+
+  // keep the latest callbacks without reopening the stream on every render
+  const handlers = useRef({ applyCounts, refreshAll });
+  handlers.current = { applyCounts, refreshAll };
+
+  useEffect(() => {
+    if (!user || typeof EventSource === "undefined") return;
+
+    const source = new EventSource(`${api.defaults.baseURL}/api/events/`, { withCredentials: true });
+
+    source.addEventListener("counts", (e) => handlers.current.applyCounts(JSON.parse(e.data)));
+    source.addEventListener("quotes", (e) => {
+      const { ids } = JSON.parse(e.data);
+      window.dispatchEvent(new CustomEvent("quotes-changed", { detail: ids }));
+    });
+    // the server dropped events for us; fall back to a full refresh
+    source.addEventListener("resync", () => {
+      handlers.current.refreshAll();
+      window.dispatchEvent(new CustomEvent("quotes-changed", { detail: null }));
+    });
+
+    return () => source.close();
+  }, [user]);
+}
@@ -43,6 +43,19 @@ function QuoteDetailPage() {
         .finally(() => setLoading(false));
     }
   }, [id, user]);
+
+  // 📡 Reload when the server reports this quote changed
+  useEffect(() => {
+    const onChange = (e) => {
+      if (e.detail && !e.detail.includes(Number(id))) return;
+      api
+        .get(`/api/quotes/${id}/`, { withCredentials: true })
+        .then((res) => setQuote(res.data))
+        .catch(() => {});
+    };
+    window.addEventListener("quotes-changed", onChange);
+    return () => window.removeEventListener("quotes-changed", onChange);
+  }, [id]);
  
   if (!quote || !user) return null;
 
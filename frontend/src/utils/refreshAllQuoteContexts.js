@@ -1,27 +1,51 @@
+import api from "../api/axios";
 import { useSignature } from "../context/SignatureContext";
 import { useUnapprovedQuotes } from "../context/UnapprovedQuoteContext";
-//import { useUnapprovedUserCount } from "../context/UnapprovedUserContext";
+import { useUnapprovedUserCount } from "../context/UnapprovedUserContext";
 import { useUnratedQuotes } from "../context/UnratedQuoteContext";
 import { useFlaggedQuotes } from "../context/FlaggedQuoteContext";
 import { useUser } from "../context/UserContext";
 
-export default function useRefreshAllQuoteContexts() {
-  const { refreshCount } = useSignature();
-  const { refreshUnapprovedCount } = useUnapprovedQuotes();
-  //const { refreshUnapprovedUserCount } = useUnapprovedUserCount();
-  const { refreshUnratedCount } = useUnratedQuotes();
-  const { refreshFlaggedCount } = useFlaggedQuotes();
-  const { user, setUser } = useUser();
-
-  const refreshAll = () => {
+// Push badge counts into their contexts; keys missing from `data` are left untouched
+export function useApplyBadgeCounts() {
+  const { setPendingCount } = useSignature();
+  const { setUnapprovedCount } = useUnapprovedQuotes();
+  const { setUnapprovedUserCount, setLoading } = useUnapprovedUserCount();
+  const { setUnratedCount } = useUnratedQuotes();
+  const { setFlaggedCount } = useFlaggedQuotes();
+  const { user } = useUser();
 
-    refreshCount?.();
-    refreshUnratedCount?.();
+  return (data) => {
+    if ("pending_signatures" in data) setPendingCount?.(data.pending_signatures);
+    if ("unrated_quotes" in data) setUnratedCount?.(data.unrated_quotes);
 
     if (user?.isSuperuser) {
-    //refreshUnapprovedUserCount?.();
-    refreshFlaggedCount?.();
-    refreshUnapprovedCount?.();
+      if ("flagged_quotes" in data) setFlaggedCount?.(data.flagged_quotes);
+      if ("unapproved_quotes" in data) setUnapprovedCount?.(data.unapproved_quotes);
+      if ("unapproved_users" in data) {
+        setUnapprovedUserCount?.(data.unapproved_users);
+        setLoading?.(false);
+      }
+    }
+  };
+}
+
+export default function useRefreshAllQuoteContexts() {
+  const applyCounts = useApplyBadgeCounts();
+  const { user } = useUser();
+
+  // 🔄 One round-trip for every badge; admin-only counts are only present for superusers
+  const refreshAll = async () => {
+    try {
+      const { data } = await api.get("/api/counts/", { withCredentials: true });
+      applyCounts({
+        pending_signatures: 0,
+        unrated_quotes: 0,
+        ...(user?.isSuperuser && { flagged_quotes: 0, unapproved_quotes: 0, unapproved_users: 0 }),
+        ...data,
+      });
+    } catch (err) {
+      console.error("Failed to fetch badge counts", err);
     }
   };
 